@@ -1,8 +1,10 @@
 import sys
+import time
+from contextlib import contextmanager
 from os.path import abspath, dirname
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config, create_engine
+from sqlalchemy import engine_from_config, create_engine, text
 from sqlalchemy import pool
 
 from alembic import context
@@ -13,7 +15,8 @@ sys.path.insert(0, dirname(dirname(abspath(__file__))))
 from src.core.config import get_settings
 from src.db.models import Base
 
-settings = get_settings()
+# 설정 객체는 URL이 실제로 필요한 실행 함수 안에서 `get_settings()`로 가져옵니다.
+# (`get_settings`는 `lru_cache`로 캐시되므로 반복 호출 비용이 없습니다.)
 
 # --- End Integration ---
 
@@ -32,6 +35,25 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# 마이그레이션 직렬화에 사용하는 advisory lock 키 (ASCII "SENT")
+MIGRATION_ADVISORY_LOCK_KEY = 0x53454E54
+# 다른 프로세스가 락을 쥐고 있을 때 재시도 간격 (초)
+MIGRATION_ADVISORY_LOCK_POLL_SECONDS = 1.0
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """
+    autogenerate가 반영(reflect)할 대상을 ORM 모델에 정의된 테이블로 한정합니다.
+
+    DB에 함께 존재하는 다른 테이블(파티션, 외부 도구가 만든 테이블 등)까지
+    컬럼/인덱스를 모두 조회하지 않도록, 테이블 이름 단계에서 걸러냅니다.
+    모델에서 제거한 테이블의 DROP은 autogenerate로 감지되지 않으므로 직접 작성해야 합니다.
+    """
+    if type_ == "table":
+        return name in target_metadata.tables
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,10 +73,13 @@ def run_migrations_offline() -> None:
 
     """
     # url = config.get_main_option("sqlalchemy.url") # 기존 방식 비활성화
+    settings = get_settings()
     url = settings.SYNC_DATABASE_URL  # 중앙 설정에서 URL 가져오기
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_schemas=False,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -63,6 +88,51 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+@contextmanager
+def migration_advisory_lock(connectable):
+    """
+    여러 컨테이너가 동시에 `alembic upgrade head`를 실행해도 한 번에 하나의 프로세스만
+    마이그레이션을 수행하도록 세션 레벨 advisory lock을 획득합니다.
+
+    락은 마이그레이션용 커넥션과 분리된 AUTOCOMMIT 커넥션에서 `pg_try_advisory_lock`을
+    주기적으로 재시도하여 획득합니다. 대기 중인 프로세스가 트랜잭션을 열어 둔 채
+    `pg_advisory_lock`에서 블로킹되면, 락을 쥔 프로세스의 `CREATE INDEX CONCURRENTLY`가
+    그 트랜잭션이 끝나기를 기다리며 서로 교착 상태에 빠지기 때문입니다.
+    락은 블록을 벗어날 때 해제되며, 프로세스가 비정상 종료되어도 커넥션이 닫히면서 해제됩니다.
+    """
+    with connectable.connect() as lock_connection:
+        lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+        lock_args = {"k": MIGRATION_ADVISORY_LOCK_KEY}
+        while not lock_connection.execute(
+            text("SELECT pg_try_advisory_lock(:k)"), lock_args
+        ).scalar():
+            time.sleep(MIGRATION_ADVISORY_LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:k)"), lock_args
+            )
+
+
+def _run_migrations_with_connection(connectable, is_postgres: bool) -> None:
+    """마이그레이션 전용 커넥션을 열어 마이그레이션을 실행합니다."""
+    with connectable.connect() as connection:
+        if is_postgres:
+            connection.execute(text("SET lock_timeout = 0"))
+            connection.commit()
+
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            include_schemas=False,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
@@ -70,16 +140,26 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    # 기존 engine_from_config 방식 대신, 중앙 설정 URL로 직접 엔진 생성
-    connectable = create_engine(settings.SYNC_DATABASE_URL)
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    settings = get_settings()
+    is_postgres = settings.SYNC_DATABASE_URL.startswith("postgresql")
+
+    # 기존 engine_from_config 방식 대신, 중앙 설정 URL로 직접 엔진 생성.
+    # 마이그레이션은 단발성 프로세스이므로 커넥션 풀을 유지하지 않고(NullPool),
+    # 사용한 커넥션은 즉시 닫아 DB에 유휴 커넥션이 남지 않도록 합니다.
+    # 대용량 테이블의 DDL이 서버 기본 statement_timeout에 걸리지 않도록 해제합니다.
+    connectable = create_engine(
+        settings.SYNC_DATABASE_URL,
+        poolclass=pool.NullPool,
+        connect_args=(
+            {"options": "-c statement_timeout=0"} if is_postgres else {}
+        ),
+    )
 
-        with context.begin_transaction():
-            context.run_migrations()
+    if is_postgres:
+        with migration_advisory_lock(connectable):
+            _run_migrations_with_connection(connectable, is_postgres)
+    else:
+        _run_migrations_with_connection(connectable, is_postgres)
 
 
 if context.is_offline_mode():
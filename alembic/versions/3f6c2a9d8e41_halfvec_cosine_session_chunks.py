@@ -0,0 +1,101 @@
+"""halfvec_cosine_session_chunks
+
+Revision ID: 3f6c2a9d8e41
+Revises: 53615b25087d
+Create Date: 2026-10-16 10:12:37.482915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from src.core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6c2a9d8e41"
+down_revision: Union[str, Sequence[str], None] = "53615b25087d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_index_build_options() -> None:
+    """
+    HNSW 인덱스 빌드에 사용할 메모리와 병렬 워커 수를 설정값으로 지정합니다.
+
+    값이 설정되지 않았으면 서버 기본값을 그대로 사용합니다. 공유 메모리가 작은
+    컨테이너에서 큰 값을 쓰면 병렬 빌드가 실패하므로 리터럴로 고정하지 않습니다.
+    """
+    settings = get_settings()
+    options = {
+        "maintenance_work_mem": settings.MIGRATION_MAINTENANCE_WORK_MEM,
+        "max_parallel_maintenance_workers": (
+            settings.MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS
+        ),
+    }
+    for name, value in options.items():
+        if value is not None:
+            op.execute(
+                text("SELECT set_config(:name, :value, false)").bindparams(
+                    name=name, value=str(value)
+                )
+            )
+
+
+def _reset_index_build_options() -> None:
+    """
+    인덱스 빌드 설정을 되돌립니다.
+
+    `upgrade head`는 모든 리비전을 하나의 트랜잭션에서 실행하므로, 되돌리지 않으면
+    이후 리비전에도 같은 설정이 적용됩니다.
+    """
+    op.execute("RESET maintenance_work_mem")
+    op.execute("RESET max_parallel_maintenance_workers")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 세션 청크 임베딩을 반정밀도(halfvec)로 전환하고, HNSW 인덱스를 코사인 거리로
+    # 다시 생성합니다. 행당 저장 크기가 3,072 → 1,536 바이트로 줄어들어
+    # ANN 탐색 시 읽어야 하는 메모리 양이 절반이 됩니다. (pgvector >= 0.7 필요)
+    op.execute("DROP INDEX IF EXISTS ix_session_chunks_embedding_hnsw")
+    op.execute(
+        """
+        ALTER TABLE session_attachment_chunks
+        ALTER COLUMN embedding TYPE halfvec(768)
+        USING embedding::halfvec(768)
+        """
+    )
+    # 768차원 임베딩에서 기본값(m=16, ef_construction=64)보다 촘촘한 그래프를 만들어
+    # 같은 재현율에서 더 작은 ef_search로 검색할 수 있도록 합니다. 빌드 메모리와
+    # 병렬 워커는 설정값으로 지정하고, 빌드 직후 되돌립니다.
+    _set_index_build_options()
+    op.execute(
+        """
+        CREATE INDEX ix_session_chunks_embedding_hnsw
+        ON session_attachment_chunks
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+        """
+    )
+    _reset_index_build_options()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_session_chunks_embedding_hnsw")
+    op.execute(
+        """
+        ALTER TABLE session_attachment_chunks
+        ALTER COLUMN embedding TYPE vector(768)
+        USING embedding::vector(768)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_session_chunks_embedding_hnsw
+        ON session_attachment_chunks
+        USING hnsw (embedding vector_l2_ops)
+        """
+    )
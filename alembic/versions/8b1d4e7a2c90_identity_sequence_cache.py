@@ -0,0 +1,40 @@
+"""identity_sequence_cache
+
+Revision ID: 8b1d4e7a2c90
+Revises: 3f6c2a9d8e41
+Create Date: 2026-10-16 11:03:58.217604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b1d4e7a2c90"
+down_revision: Union[str, Sequence[str], None] = "3f6c2a9d8e41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 쓰기가 집중되는 테이블의 IDENTITY 시퀀스가 값을 1,000개씩 미리 할당하도록 하여
+    # 대량/동시 INSERT 시 시퀀스 경합을 줄입니다. (테이블 재작성 없음)
+    op.execute(
+        "ALTER TABLE chat_history ALTER COLUMN message_id SET CACHE 1000"
+    )
+    op.execute(
+        "ALTER TABLE session_attachment_chunks "
+        "ALTER COLUMN chunk_id SET CACHE 1000"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE chat_history ALTER COLUMN message_id SET CACHE 1")
+    op.execute(
+        "ALTER TABLE session_attachment_chunks "
+        "ALTER COLUMN chunk_id SET CACHE 1"
+    )
@@ -0,0 +1,49 @@
+"""session_attachments_temporary_partial_index
+
+Revision ID: a7d2f9c4e1b3
+Revises: e5a8c3d1f6b4
+Create Date: 2026-10-16 18:05:12.264381
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d2f9c4e1b3"
+down_revision: Union[str, Sequence[str], None] = "e5a8c3d1f6b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 세션 KB 검색은 "이 세션에서 인덱싱이 완료된(temporary) 첨부파일"만 조인합니다.
+    # 해당 행만 담은 부분 인덱스로 조인 대상 attachment_id를 인덱스 전용 스캔으로 찾습니다.
+    # 첨부/인덱싱 중에도 쓰기를 막지 않도록 CONCURRENTLY로 생성합니다.
+    # 중단된 CONCURRENTLY 생성이 남긴 INVALID 인덱스는 `IF NOT EXISTS`가 건너뛰므로,
+    # 생성 전에 같은 이름의 인덱스를 먼저 삭제합니다.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_session_attachments_session_temporary"
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_session_attachments_session_temporary
+            ON session_attachments (session_id, attachment_id)
+            WHERE status = 'temporary'
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_session_attachments_session_temporary"
+        )
@@ -0,0 +1,77 @@
+"""chat_history_composite_indexes
+
+Revision ID: c4e9a1f3b7d2
+Revises: 8b1d4e7a2c90
+Create Date: 2026-10-16 11:41:20.903517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e9a1f3b7d2"
+down_revision: Union[str, Sequence[str], None] = "8b1d4e7a2c90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # chat_history는 운영 중 계속 쓰기가 발생하는 테이블이므로, INSERT를 막지 않도록
+    # CONCURRENTLY로 인덱스를 생성/삭제합니다. (트랜잭션 밖에서만 실행 가능)
+    # 중단된 CONCURRENTLY 생성은 INVALID 인덱스를 남기고, `IF NOT EXISTS`는 이를
+    # 건너뛰므로 생성 전에 같은 이름의 인덱스를 먼저 삭제합니다.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_session_created"
+        )
+        # "이 세션의 대화 기록을 시간순으로" 조회를 인덱스 순서 그대로 처리합니다.
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_chat_history_session_created
+            ON chat_history (session_id, created_at)
+            """
+        )
+        # "이 사용자의 최근 메시지 N개" 조회를 정렬 없이 LIMIT으로 끊을 수 있도록 합니다.
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_user_created"
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_chat_history_user_created
+            ON chat_history (user_id, created_at DESC)
+            """
+        )
+        # 새 복합 인덱스의 선두 컬럼과 겹치는 단일 컬럼 인덱스는 제거합니다.
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_session_id"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_user_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_user_id")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_history_user_id "
+            "ON chat_history (user_id)"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_session_id"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_history_session_id "
+            "ON chat_history (session_id)"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_user_created"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_chat_history_session_created"
+        )
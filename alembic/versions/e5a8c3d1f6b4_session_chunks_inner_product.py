@@ -0,0 +1,140 @@
+"""session_chunks_inner_product
+
+Revision ID: e5a8c3d1f6b4
+Revises: c4e9a1f3b7d2
+Create Date: 2026-10-16 17:52:08.316204
+
+잠금 영향: 모든 작업이 트랜잭션 밖(autocommit)에서 실행되므로 테이블 전체를 잠그지 않습니다.
+- 정규화 UPDATE는 `_NORMALIZE_BATCH_SIZE`행씩 나누어 커밋하며, 각 배치가 끝날 때까지만
+  해당 행의 잠금을 유지합니다. (배치당 수십 ms 수준)
+- HNSW 인덱스는 CONCURRENTLY로 삭제/생성하므로 그동안에도 청크 적재와 삭제가 가능합니다.
+  인덱스가 다시 생성될 때까지(청크 수에 비례, 수십만 행 기준 수 분) 세션 KB 검색은
+  인덱스 없이 세션 단위로 필터링하여 실행됩니다.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from src.core.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a8c3d1f6b4"
+down_revision: Union[str, Sequence[str], None] = "c4e9a1f3b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 한 번에 정규화하여 커밋할 청크 수
+_NORMALIZE_BATCH_SIZE = 5000
+
+_NORMALIZE_BATCH_SQL = text(
+    """
+    WITH batch AS (
+        SELECT chunk_id
+        FROM session_attachment_chunks
+        WHERE chunk_id > :last_chunk_id
+        ORDER BY chunk_id
+        LIMIT :batch_size
+    )
+    UPDATE session_attachment_chunks AS c
+    SET embedding = l2_normalize(c.embedding)
+    FROM batch
+    WHERE c.chunk_id = batch.chunk_id
+    RETURNING c.chunk_id
+    """
+)
+
+
+def _set_index_build_options() -> None:
+    """인덱스 빌드 메모리와 병렬 워커 수를 설정값으로 지정합니다. (미지정 시 서버 기본값)"""
+    settings = get_settings()
+    options = {
+        "maintenance_work_mem": settings.MIGRATION_MAINTENANCE_WORK_MEM,
+        "max_parallel_maintenance_workers": (
+            settings.MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS
+        ),
+    }
+    for name, value in options.items():
+        if value is not None:
+            op.execute(
+                text("SELECT set_config(:name, :value, false)").bindparams(
+                    name=name, value=str(value)
+                )
+            )
+
+
+def _reset_index_build_options() -> None:
+    """이후 리비전에 영향을 주지 않도록 인덱스 빌드 설정을 되돌립니다."""
+    op.execute("RESET maintenance_work_mem")
+    op.execute("RESET max_parallel_maintenance_workers")
+
+
+def _rebuild_hnsw_index(opclass: str) -> None:
+    """HNSW 인덱스를 주어진 연산자 클래스로 CONCURRENTLY 생성합니다."""
+    _set_index_build_options()
+    op.execute(
+        f"""
+        CREATE INDEX CONCURRENTLY ix_session_chunks_embedding_hnsw
+        ON session_attachment_chunks
+        USING hnsw (embedding {opclass})
+        WITH (m = 24, ef_construction = 128)
+        """
+    )
+    _reset_index_build_options()
+
+
+def _normalize_embeddings() -> None:
+    """기존 청크 임베딩을 chunk_id 순으로 배치마다 정규화하고 커밋합니다."""
+    if op.get_context().as_sql:
+        # 오프라인(SQL 스크립트) 모드에서는 결과를 읽을 수 없으므로 한 문장으로 출력합니다.
+        op.execute(
+            "UPDATE session_attachment_chunks "
+            "SET embedding = l2_normalize(embedding)"
+        )
+        return
+
+    bind = op.get_bind()
+    last_chunk_id = 0
+    while True:
+        chunk_ids = (
+            bind.execute(
+                _NORMALIZE_BATCH_SQL,
+                {
+                    "last_chunk_id": last_chunk_id,
+                    "batch_size": _NORMALIZE_BATCH_SIZE,
+                },
+            )
+            .scalars()
+            .all()
+        )
+        if not chunk_ids:
+            break
+        last_chunk_id = max(chunk_ids)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 청크 임베딩은 적재 시 단위 길이로 정규화되므로, 검색마다 노름을 계산하는
+    # 코사인 거리 대신 내적(`<#>`)으로 검색합니다. 기존 행도 같은 불변식을
+    # 만족하도록 정규화한 뒤, HNSW 인덱스를 halfvec_ip_ops로 다시 생성합니다.
+    # 인덱스를 먼저 삭제하여 정규화 UPDATE가 기존 인덱스를 갱신하지 않도록 합니다.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_session_chunks_embedding_hnsw"
+        )
+        _normalize_embeddings()
+        _rebuild_hnsw_index("halfvec_ip_ops")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 정규화된 벡터는 코사인 검색에서도 그대로 유효하므로 인덱스만 되돌립니다.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_session_chunks_embedding_hnsw"
+        )
+        _rebuild_hnsw_index("halfvec_cosine_ops")
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+# 설정 객체(`get_settings()`)를 읽는 모듈을 단위 테스트에서 임포트할 수 있도록,
+# 필수 설정값이 환경에 없으면 테스트용 값으로 채웁니다. (실제 DB에는 연결하지 않습니다.)
+for _name, _value in {
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "AUTH_SECRET_KEY": "test-secret-key",
+}.items():
+    os.environ.setdefault(_name, _value)
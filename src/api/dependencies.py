@@ -6,29 +6,30 @@ FastAPI 의존성 주입(Dependency Injection) 시스템을 위한 "제공자(Pr
 객체(예: DB 세션, 설정 객체, 인증된 사용자 정보)를 주입하는 역할을 합니다.
 
 주요 개념:
-- **싱글톤 의존성**: `@lru_cache`를 사용하여 애플리케이션 전체에서 단 하나의 인스턴스만 생성되도록 합니다.
-  (예: `get_settings`, `get_agent`)
+- **싱글톤 의존성**: 앱 시작 시(lifespan) 한 번만 생성되어 `app.state`에 보관되고,
+  요청마다 그대로 반환됩니다. (예: `get_agent`, `get_redis_client`)
 - **요청 단위 의존성(Request-scoped)**: 모든 API 요청마다 새로 생성되고, 요청이 끝나면 정리됩니다.
   (예: `get_db_session`)
 """
 
-from functools import lru_cache
 from typing import AsyncGenerator
+import asyncio
+import hashlib
 import time
 import redis.asyncio as aioredis
+from cachetools import TTLCache
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
 from ..core import factories
-from ..core.database import AsyncSessionLocal
+from ..core.database import AsyncSessionLocal, ReadOnlySessionLocal
 from ..core.agent import Orchestrator
-from ..core.config import Settings, get_settings
+from ..core.config import get_settings
 from ..core.security import verify_token
-from ..components.vector_stores.pg_vector_store import PgVectorStore
 from ..core.logger import get_logger
+from ..services import user_service
 from . import schemas
 
 logger = get_logger(__name__)
@@ -39,14 +40,114 @@ logger = get_logger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 
-@lru_cache
-def get_agent() -> Orchestrator:
+def _credentials_exception() -> HTTPException:
+    """
+    인증 실패 시 반환하는 401 예외를 생성합니다.
+
+    예외 인스턴스는 트레이스백과 컨텍스트를 담고 있으므로, 이벤트 루프와 스레드 풀에서
+    동시에 발생시킬 수 있도록 공유하지 않고 발생시킬 때마다 새로 만듭니다.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="자격 증명을 검증할 수 없습니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+# 검증에 성공한 JWT 토큰의 페이로드를 짧게 캐싱하여, 같은 토큰으로 들어오는 연속된 요청에서
+# 서명 검증을 반복하지 않도록 합니다. 키는 토큰 원문 대신 SHA-256 다이제스트를 사용합니다.
+# 검증에 실패한 토큰은 캐싱하지 않으며, 토큰의 `exp`가 지나면 TTL과 관계없이 무효로 취급합니다.
+# (트레이드오프: 서명 키 교체 등은 최대 TTL만큼 늦게 반영됩니다.)
+_TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_TOKEN_CACHE_TTL_SECONDS)
+# 검증에 실패한 토큰의 다이제스트. 같은 잘못된 토큰이 반복해서 들어와도 서명 검증을 다시
+# 수행하지 않고 바로 거부합니다. 거부된 토큰이 나중에 유효해지는 일은 없으므로 stale 문제가 없습니다.
+_rejected_token_cache: TTLCache = TTLCache(maxsize=50_000, ttl=60)
+
+
+# RSA/ECDSA 등 비대칭 서명 검증은 요청당 수백 μs의 CPU를 사용하므로 이벤트 루프를 막지 않도록
+# 스레드에서 실행합니다. HMAC(HS*) 검증은 스레드 전환 비용보다 빠르므로 그대로 실행합니다.
+_VERIFY_TOKEN_IN_THREAD = not get_settings().AUTH_ALGORITHM.startswith("HS")
+
+
+async def _verify_token_cached(token: str) -> schemas.TokenData:
+    """`verify_token`의 결과를 `_token_cache`에 캐싱하여 반환합니다."""
+    key = hashlib.sha256(token.encode()).digest()
+    if key in _rejected_token_cache:
+        raise _credentials_exception()
+    token_data = _token_cache.get(key)
+    if token_data is not None:
+        if token_data.exp is None or token_data.exp > time.time():
+            return token_data
+        # 캐시 TTL이 남아 있어도 토큰 자체가 만료되었다면 다시 검증하도록 합니다.
+        _token_cache.pop(key, None)
+
+    try:
+        if _VERIFY_TOKEN_IN_THREAD:
+            token_data = await asyncio.to_thread(
+                verify_token, token, _credentials_exception()
+            )
+        else:
+            token_data = verify_token(token, _credentials_exception())
+    except HTTPException:
+        _rejected_token_cache[key] = True
+        raise
+    _token_cache[key] = token_data
+    return token_data
+
+
+# 인증된 사용자 정보(`UserInDB`)를 사용자 이름 기준으로 짧게 캐싱하여, 같은 사용자의
+# 연속된 요청마다 `users`/`user_profile` 조회 쿼리를 실행하지 않도록 합니다.
+# 캐시는 프로세스마다 따로 존재하고 `invalidate_user_cache()`는 현재 프로세스만 무효화하므로,
+# 다른 워커 프로세스에서는 비활성화/비밀번호 변경이 최대 TTL만큼 늦게 반영됩니다.
+# 이 지연이 보안상 허용 가능한 수준이 되도록 TTL을 몇 초로 제한합니다.
+_USER_CACHE_TTL_SECONDS = 5
+_user_cache: TTLCache = TTLCache(maxsize=5_000, ttl=_USER_CACHE_TTL_SECONDS)
+# 존재하지 않는 사용자 이름. 같은 이름으로 반복되는 로그인 시도(사용자 이름 대입 등)가
+# 매번 DB를 조회하지 않도록 짧게 기억합니다. 가입 시 `invalidate_user_cache()`로 제거됩니다.
+_missing_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+
+
+def invalidate_user_cache(username: str) -> None:
+    """사용자 정보가 변경되거나 새로 생성되었을 때 캐시된 조회 결과를 제거합니다."""
+    _user_cache.pop(username, None)
+    _missing_user_cache.pop(username, None)
+
+
+async def get_user_by_username(username: str) -> schemas.UserInDB | None:
+    """
+    사용자 이름으로 `UserInDB`를 조회합니다. 캐시에 없을 때만 조회용 세션을 열어 DB를 읽습니다.
+
+    인증 의존성(`get_current_user`)과 로그인 엔드포인트가 같은 캐시를 공유합니다.
+    캐시된 객체는 요청 간에 공유되므로 호출 측에서 수정하면 안 됩니다.
+
+    Returns:
+        schemas.UserInDB | None: 사용자 정보. 존재하지 않으면 None.
+    """
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+    if username in _missing_user_cache:
+        return None
+
+    async with ReadOnlySessionLocal() as session:
+        user = await user_service.fetch_user_by_username(session, username)
+
+    if user is None:
+        _missing_user_cache[username] = True
+        return None
+
+    _user_cache[username] = user
+    return user
+
+
+def build_agent() -> Orchestrator:
     """
     애플리케이션의 핵심 로직을 수행하는 `Agent` 인스턴스를 생성하고 반환합니다.
 
-    `@lru_cache`를 통해 `Agent`와 그에 필요한 모든 하위 컴포넌트(LLM, Vector Store 등)들이
-    애플리케이션 시작 시 단 한 번만 초기화되도록 합니다. 이는 비용이 큰 모델 로딩 등의
-    작업을 반복하지 않게 하여 성능을 크게 향상시킵니다.
+    앱 시작 시(`main.py`의 lifespan) 단 한 번 호출되어, `Agent`와 그에 필요한 모든
+    하위 컴포넌트(LLM, Vector Store 등)를 미리 초기화합니다. 이는 비용이 큰 모델 로딩 등의
+    작업을 반복하지 않게 하고, 첫 요청이 초기화 시간을 떠안지 않도록 합니다.
     """
     logger.info(
         "핵심 Agent 및 하위 컴포넌트(LLM, Vector Store 등)를 초기화합니다..."
@@ -87,10 +188,14 @@ def get_agent() -> Orchestrator:
     return agent
 
 
-@lru_cache
-def get_redis_pool() -> aioredis.ConnectionPool:
+def get_agent(request: Request) -> Orchestrator:
+    """앱 시작 시 생성되어 `app.state`에 보관된 싱글톤 `Agent`를 반환합니다."""
+    return request.app.state.agent
+
+
+def build_redis_pool() -> aioredis.ConnectionPool:
     """
-    세션 저장을 위한 Redis 커넥션 풀을 생성하고 캐시합니다.
+    세션 저장을 위한 Redis 커넥션 풀을 생성합니다. (앱 시작 시 한 번 호출)
     Celery(0, 1)와 다른 DB(2)를 사용합니다.
     커넥션 풀을 사용하면 요청마다 TCP 연결을 새로 맺고 끊는 오버헤드를 줄여 성능을 향상시킵니다.
     """
@@ -103,26 +208,15 @@ def get_redis_pool() -> aioredis.ConnectionPool:
     )
 
 
-async def get_redis_client(
-    pool: aioredis.ConnectionPool = Depends(get_redis_pool),
-) -> AsyncGenerator[aioredis.Redis, None]:
+def get_redis_client(request: Request) -> aioredis.Redis:
     """
-    API 요청마다 Redis 풀에서 클라이언트를 가져오는 의존성입니다.
-    `async with` 구문을 사용하여 요청 처리가 끝나면 클라이언트가 자동으로 풀에 반환되도록 합니다.
+    앱 전체에서 공유하는 Redis 클라이언트를 반환하는 의존성입니다.
+
+    `redis.asyncio.Redis`는 커넥션 풀을 통해 명령마다 연결을 빌려 쓰고 반환하므로,
+    여러 요청(태스크)이 하나의 클라이언트를 동시에 사용해도 안전합니다.
+    따라서 요청마다 클라이언트를 새로 만들지 않고 `app.state.redis`를 그대로 반환합니다.
     """
-    logger.debug("Redis 풀에서 클라이언트를 가져옵니다.")
-    async with aioredis.Redis(connection_pool=pool) as redis:
-        try:
-            yield redis
-        except Exception as e:
-            logger.error(
-                f"Redis 클라이언트 작업 중 오류 발생: {e}", exc_info=True
-            )
-            raise
-        finally:
-            # `async with` 블록이 끝나면 클라이언트는 자동으로 풀에 반환되므로,
-            # 여기서는 로깅만 수행합니다.
-            logger.debug("Redis 클라이언트를 풀에 반환합니다.")
+    return request.app.state.redis
 
 
 # --- 요청 단위 의존성 (API 요청마다 생성 및 소멸) ---
@@ -150,51 +244,46 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+async def get_read_only_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    조회(SELECT)만 수행하는 엔드포인트를 위한 DB 세션 의존성입니다.
+
+    AUTOCOMMIT 모드로 실행되므로 트랜잭션을 시작하거나 커밋하지 않습니다.
+    요청 처리 중 데이터를 변경해야 한다면 `get_db_session`을 사용해야 합니다.
+    """
+    async with ReadOnlySessionLocal() as session:
+        yield session
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_db_session),
 ) -> schemas.UserInDB:
     """
     HTTP 요청 헤더의 JWT 토큰을 검증하고, 데이터베이스에서 최신 사용자 정보를 조회하여 반환합니다.
     인증 실패 시 `HTTPException` (401 Unauthorized)을 발생시킵니다.
 
+    `get_db_session`에 의존하지 않고, 사용자 캐시에 없을 때만 조회용 세션을 직접 엽니다.
+    따라서 캐시 적중 시에는 커넥션 풀에서 연결을 꺼내거나 트랜잭션을 커밋하지 않습니다.
+
     Args:
         token (str): `oauth2_scheme`에 의해 Authorization 헤더에서 추출된 Bearer 토큰.
-        session (AsyncSession): `get_db_session`으로부터 주입된 DB 세션.
 
     Returns:
         schemas.UserInDB: 인증된 사용자의 정보 (DB 스키마 모델).
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="자격 증명을 검증할 수 없습니다.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    # JWT 토큰의 유효성(서명, 만료 시간 등)을 검증합니다.
-    token_data = verify_token(token, credentials_exception)
+    # JWT 토큰의 유효성(서명, 만료 시간 등)을 검증합니다. (최근 검증된 토큰은 캐시 사용)
+    token_data = await _verify_token_cached(token)
     logger.debug(f"토큰 검증 성공: 사용자 '{token_data.username}'")
 
-    # 토큰에 포함된 사용자 이름으로 DB에서 실제 사용자 정보를 조회합니다.
-    # 이는 사용자가 비활성화되거나 권한이 변경된 경우를 실시간으로 반영하기 위함입니다.
-    stmt = text(
-        """
-        SELECT u.*, p.profile_text 
-        FROM users u
-        LEFT JOIN user_profile p ON u.user_id = p.user_id
-        WHERE u.username = :username
-    """
-    )
-    result = await session.execute(stmt, {"username": token_data.username})
-    user_row = result.fetchone()
-
-    if user_row is None:
+    # 토큰에 포함된 사용자 이름으로 실제 사용자 정보를 조회합니다.
+    # 사용자가 비활성화되거나 정보가 변경된 경우가 최대 캐시 TTL 이내에 반영되도록,
+    # 캐시에 없을 때만 DB를 조회합니다.
+    user = await get_user_by_username(token_data.username)
+    if user is None:
         logger.warning(
             f"토큰은 유효하지만 DB에 사용자 '{token_data.username}'가 존재하지 않습니다."
         )
-        raise credentials_exception
-
-    user = schemas.UserInDB(**user_row._asdict())
+        raise _credentials_exception()
 
     if not user.is_active:
         logger.warning(f"비활성화된 사용자 '{user.username}'의 접근 시도.")
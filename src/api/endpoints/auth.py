@@ -7,38 +7,96 @@ API 라우터: 인증 (Authentication)
 - **/token**: 로그인 및 JWT 액세스 토큰 발급
 - **/me**: 현재 로그인된 사용자 정보 조회
 """
-from typing import Dict
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, exc as sqlalchemy_exc
+from sqlalchemy import text
 
 from .. import dependencies, schemas
 from ...core import security
+from ...core.config import get_settings
+from ...core.database import AsyncSessionLocal
 from ...core.logger import get_logger
 
 router = APIRouter(prefix="", tags=["Authentication"])
 logger = get_logger(__name__)
 
+# 요청마다 실행되는 고정 SQL은 모듈 로드 시 한 번만 `text()`로 생성하여 재사용합니다.
+# 사용자 이름이 이미 존재하면 `ON CONFLICT DO NOTHING`에 의해 아무 행도 반환되지 않으므로,
+# 중복 확인과 삽입을 한 번의 왕복으로 처리합니다.
+_INSERT_USER_SQL = text(
+    """
+    INSERT INTO users (username, hashed_password, is_active)
+    VALUES (:username, :hashed_password, :is_active)
+    ON CONFLICT (username) DO NOTHING
+    RETURNING user_id, username, is_active, created_at
+    """
+)
+_UPDATE_PASSWORD_HASH_SQL = text(
+    "UPDATE users SET hashed_password = :hashed_password WHERE user_id = :user_id"
+)
+
+# 비밀번호 해싱/검증 전용 스레드 풀. 기본 executor(`asyncio.to_thread`)를 함께 쓰는
+# 리랭커, 토큰 검증, 작업 위임과 경쟁하지 않도록 분리하고, 동시에 실행되는 해싱 수를
+# 제한하여 로그인/가입 요청이 몰려도 CPU와 메모리(Argon2id 작업당 64MiB) 사용량이 일정하도록 합니다.
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=get_settings().AUTH_PASSWORD_HASH_WORKERS or os.cpu_count(),
+    thread_name_prefix="password-hash",
+)
+
+_T = TypeVar("_T")
+
+
+async def _run_password_hash(func: Callable[..., _T], *args: Any) -> _T:
+    """CPU를 많이 사용하는 비밀번호 해싱/검증 함수를 전용 스레드 풀에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_hash_executor, func, *args)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dummy_password_hash() -> str:
+    """
+    존재하지 않는 사용자로 로그인을 시도할 때 비교에 사용할 비밀번호 해시를 반환합니다.
+
+    실제 사용자와 같은 비용의 검증을 수행하도록 한 번만 생성하여 재사용합니다.
+    모듈 로드 시점이 아니라 첫 사용 시점에 (해싱 전용 스레드 풀 안에서) 생성하므로,
+    해싱 백엔드 문제로 애플리케이션 임포트가 실패하거나 이벤트 루프가 막히지 않습니다.
+    """
+    return security.get_password_hash("sentinel-dummy-password")
 
-async def _get_user_from_db(
-    session: AsyncSession, username: str
-) -> schemas.UserInDB | None:
-    """데이터베이스에서 사용자 이름으로 사용자 정보를 조회하는 헬퍼 함수."""
-    logger.debug(f"데이터베이스에서 사용자 '{username}' 조회를 시도합니다.")
-    stmt = text("SELECT * FROM users WHERE username = :username")
-    result = await session.execute(stmt, {"username": username})
-    user_row = result.fetchone()
 
-    if user_row:
-        logger.debug(f"데이터베이스에서 사용자 '{username}'를 찾았습니다.")
-        # SQLAlchemy의 Row 객체를 Pydantic 모델로 변환하여 반환합니다.
-        return schemas.UserInDB(**user_row._asdict())
+def _verify_login_password(
+    password: str, password_hash: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """비밀번호를 검증합니다. 저장된 해시가 없으면 더미 해시로 같은 비용의 검증을 수행합니다."""
+    return security.verify_and_update_password(
+        password, password_hash or _get_dummy_password_hash()
+    )
 
-    # 사용자를 찾지 못한 경우, 명시적으로 None을 반환하여 호출 측에서 처리하도록 합니다.
-    logger.debug(f"데이터베이스에서 사용자 '{username}'를 찾을 수 없습니다.")
-    return None
+
+async def _rehash_user_password(
+    user: schemas.UserInDB, new_password_hash: str
+) -> None:
+    """저장된 비밀번호 해시를 새 방식으로 교체합니다. 실패해도 로그인은 계속 진행합니다."""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                _UPDATE_PASSWORD_HASH_SQL,
+                {"user_id": user.user_id, "hashed_password": new_password_hash},
+            )
+            await session.commit()
+        dependencies.invalidate_user_cache(user.username)
+        logger.info(f"사용자 '{user.username}'의 비밀번호 해시를 갱신했습니다.")
+    except Exception:
+        logger.exception(
+            f"사용자 '{user.username}'의 비밀번호 해시 갱신에 실패했습니다."
+        )
 
 
 @router.post(
@@ -55,80 +113,61 @@ async def register_user(
     새로운 사용자를 시스템에 등록합니다.
 
     - **사용자 이름 중복 확인**: 이미 존재하는 사용자 이름으로는 등록할 수 없습니다.
-    - **비밀번호 해싱**: 비밀번호는 `bcrypt`로 해싱되어 안전하게 저장됩니다.
+    - **비밀번호 해싱**: 비밀번호는 `Argon2id`로 해싱되어 안전하게 저장됩니다.
     - **데이터베이스 저장**: 사용자 정보를 `users` 테이블에 저장합니다.
     """
     logger.info(f"새 사용자 등록을 시도합니다: '{user_create.username}'")
 
-    # 1. 사용자 이름이 이미 존재하는지 확인하여 중복 가입을 방지합니다.
-    db_user = await _get_user_from_db(session, user_create.username)
-    if db_user:
-        logger.warning(
-            f"등록 실패: 사용자 이름 '{user_create.username}'이(가) 이미 존재합니다."
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered",
-        )
-
-    # 2. 비밀번호를 bcrypt를 사용하여 안전하게 해시합니다. 원본 비밀번호는 절대 저장하지 않습니다.
-    hashed_password = security.get_password_hash(user_create.password)
+    # 1. 비밀번호를 Argon2id를 사용하여 안전하게 해시합니다. 원본 비밀번호는 절대 저장하지 않습니다.
+    #    비밀번호 해싱은 수십~수백 ms의 CPU를 사용하므로 이벤트 루프를 막지 않도록 전용 스레드 풀에서 실행합니다.
+    hashed_password = await _run_password_hash(
+        security.get_password_hash, user_create.password
+    )
     logger.debug(
         f"사용자 '{user_create.username}'의 비밀번호 해싱을 완료했습니다."
     )
 
-    # 3. 새로운 사용자 정보를 데이터베이스에 삽입합니다.
+    # 2. 새로운 사용자 정보를 데이터베이스에 삽입합니다.
     # `RETURNING` 절을 사용하여 삽입된 레코드의 정보를 즉시 반환받아,
     # 별도의 SELECT 쿼리 없이 응답 데이터를 구성할 수 있습니다.
-    stmt = text(
-        """
-        INSERT INTO users (username, hashed_password, is_active)
-        VALUES (:username, :hashed_password, :is_active)
-        RETURNING user_id, username, is_active, created_at
-    """
-    )
-
+    # 중복 확인도 같은 문장의 `ON CONFLICT`로 처리하므로, 동시 가입 요청 간의 경쟁 조건이 없습니다.
     try:
         result = await session.execute(
-            stmt,
+            _INSERT_USER_SQL,
             {
                 "username": user_create.username,
                 "hashed_password": hashed_password,
                 "is_active": True,
             },
         )
-        new_user_row = result.fetchone()
-        if not new_user_row:
-            # 삽입 후 RETURNING 절에서 데이터를 가져오지 못한 경우, 심각한 오류로 간주합니다.
-            logger.error(
-                f"사용자 '{user_create.username}' 삽입 후 데이터 조회를 실패했습니다."
-            )
-            raise HTTPException(
-                status_code=500, detail="Failed to create user after insertion."
-            )
-
-        logger.info(
-            f"사용자 '{user_create.username}' (ID: {new_user_row.user_id}) 등록에 성공했습니다."
+        new_user_row = result.mappings().first()
+        # 캐시를 비우기 전에 커밋하여, 그 사이에 들어온 로그인이 커밋 전 상태(행 없음)를
+        # 읽고 '존재하지 않는 사용자'로 다시 캐싱하지 않도록 합니다.
+        await session.commit()
+    except Exception as e:
+        logger.exception(
+            f"사용자 '{user_create.username}' 등록 중 예기치 않은 데이터베이스 오류가 발생했습니다."
+        )
+        raise HTTPException(
+            status_code=500, detail=f"A database error occurred: {e}"
         )
-        return schemas.User(**new_user_row._asdict())
 
-    except sqlalchemy_exc.IntegrityError:
-        # 거의 동시에 동일한 사용자 이름으로 가입 요청이 들어올 경우,
-        # 첫 번째 검사를 통과했더라도 DB의 UNIQUE 제약 조건에 의해 이 오류가 발생할 수 있습니다.
+    if new_user_row is None:
+        # 반환된 행이 없으면 UNIQUE 제약 조건과 충돌한 것, 즉 이미 존재하는 사용자 이름입니다.
         logger.warning(
-            f"등록 실패: 사용자 이름 '{user_create.username}'이(가) 이미 존재합니다 (IntegrityError)."
+            f"등록 실패: 사용자 이름 '{user_create.username}'이(가) 이미 존재합니다."
         )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-    except Exception as e:
-        logger.exception(
-            f"사용자 '{user_create.username}' 등록 중 예기치 않은 데이터베이스 오류가 발생했습니다."
-        )
-        raise HTTPException(
-            status_code=500, detail=f"A database error occurred: {e}"
-        )
+
+    # 커밋 이후에 로그인 경로에 캐시된 '존재하지 않는 사용자' 기록을 제거합니다.
+    dependencies.invalidate_user_cache(user_create.username)
+    logger.info(
+        f"사용자 '{user_create.username}' (ID: {new_user_row['user_id']}) 등록에 성공했습니다."
+    )
+    return schemas.User.model_construct(**new_user_row)
 
 
 @router.post(
@@ -138,7 +177,6 @@ async def login_for_access_token(
     # FastAPI의 `OAuth2PasswordRequestForm`은 'x-www-form-urlencoded' 형식의 요청 본문을
     # 파싱하여 사용자 이름과 비밀번호를 추출하는 편리한 의존성입니다.
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: AsyncSession = Depends(dependencies.get_db_session),
 ) -> Dict[str, str]:
     """
     사용자 이름과 비밀번호로 로그인하여 JWT 액세스 토큰을 발급받습니다.
@@ -150,12 +188,21 @@ async def login_for_access_token(
     password = form_data.password
     logger.info(f"사용자 '{username}'의 로그인을 시도합니다.")
 
-    # 1. 데이터베이스에서 사용자 정보를 조회합니다.
-    user = await _get_user_from_db(session, username)
+    # 1. 사용자 정보를 조회합니다. 인증 의존성과 같은 캐시를 공유하므로, 최근 조회된
+    #    사용자(또는 존재하지 않는 사용자 이름)는 DB를 다시 조회하지 않습니다.
+    user = await dependencies.get_user_by_username(username)
 
     # 2. 사용자가 존재하고, 제공된 비밀번호가 저장된 해시와 일치하는지 확인합니다.
     #    `verify_password`는 시간 일정 공격(timing attack)에 안전한 비교를 수행합니다.
-    if not user or not security.verify_password(password, user.hashed_password):
+    #    해싱과 마찬가지로 CPU를 많이 사용하므로 전용 스레드 풀에서 실행합니다.
+    #    사용자가 없어도 더미 해시로 같은 검증을 수행하여, 응답 시간 차이로
+    #    사용자 이름의 존재 여부를 추측할 수 없도록 합니다.
+    password_ok, new_password_hash = await _run_password_hash(
+        _verify_login_password,
+        password,
+        user.hashed_password if user else None,
+    )
+    if not user or not password_ok:
         logger.warning(
             f"로그인 실패: 사용자 '{username}'의 사용자 이름 또는 비밀번호가 잘못되었습니다."
         )
@@ -173,6 +220,10 @@ async def login_for_access_token(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
 
+    # 기존 bcrypt 해시로 로그인한 사용자는 Argon2id 해시로 교체합니다.
+    if new_password_hash:
+        await _rehash_user_password(user, new_password_hash)
+
     # 3. JWT 액세스 토큰을 생성합니다.
     # 토큰의 페이로드(payload)에는 'sub'(subject, 사용자 이름)와 같은 표준 클레임과
     # 애플리케이션별 커스텀 데이터('permission_groups')를 포함할 수 있습니다.
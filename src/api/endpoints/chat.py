@@ -10,6 +10,7 @@ API 라우터: 채팅 (Chat)
 -   `/sessions/{session_id}/attach`: 특정 세션에 임시 파일을 첨부하고 인덱싱합니다.
 -   `/profile`: 사용자의 프로필 정보를 조회하고 업데이트합니다.
 """
+import asyncio
 import json
 import redis.asyncio as aioredis
 import aiofiles
@@ -30,7 +31,7 @@ from fastapi import (
     Form,
 )
 from fastapi.responses import StreamingResponse
-from sqlalchemy import update
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import dependencies, schemas
@@ -216,30 +217,24 @@ async def attach_file_to_session(
         logger.error(f"파일 저장 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="File save failed.")
 
-    try:
-        # DB에 'session_attachments' 레코드를 생성하여 파일 정보를 관리합니다.
-        # 이 레코드는 파일의 상태(indexing, temporary, promoted)를 추적하는 데 사용됩니다.
-        new_attachment = models.SessionAttachment(
-            session_id=session_id,
-            user_id=current_user.user_id,
-            file_name=file.filename,
-            file_path=str(file_path),  # 워커가 참조할 경로
-            status="indexing",
-        )
-        db_session.add(new_attachment)
-        await db_session.commit()
-        await db_session.refresh(new_attachment)
-        attachment_id = new_attachment.attachment_id
-        logger.debug(f"DB 레코드 생성 완료 (Attachment ID: {attachment_id})")
-    except Exception as e:
-        logger.error(f"첨부파일 DB 레코드 생성 실패: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500, detail="DB record creation failed."
-        )
+    # DB에 'session_attachments' 레코드를 생성하여 파일 정보를 관리합니다.
+    # 이 레코드는 파일의 상태(indexing, temporary, promoted)를 추적하는 데 사용됩니다.
+    new_attachment = await chat_service.create_session_attachment(
+        db_session=db_session,
+        session_id=session_id,
+        user_id=current_user.user_id,
+        file_name=file.filename,
+        file_path=str(file_path),  # 워커가 참조할 경로
+        status="indexing",
+    )
+    attachment_id = new_attachment.attachment_id
 
     # 시간이 오래 걸리는 인덱싱 작업을 Celery 워커에게 위임하고, API는 즉시 응답합니다.
     # 이를 통해 클라이언트는 긴 시간 동안 응답을 기다릴 필요가 없습니다.
-    task = tasks.process_session_attachment_indexing.delay(
+    # `.delay()`는 브로커(Redis)에 동기적으로 메시지를 쓰므로, 이벤트 루프를 막지 않도록
+    # 스레드에서 호출합니다.
+    task = await asyncio.to_thread(
+        tasks.process_session_attachment_indexing.delay,
         attachment_id=attachment_id,
         file_path=str(file_path),
         file_name=file.filename,
@@ -287,8 +282,10 @@ async def attach_github_to_session(
 
     # 2. API 서버는 리포지토리를 직접 클론하지 않고, Celery 워커에게 URL만 전달합니다.
     #    무거운 클론 및 인덱싱 작업은 워커 프로세스가 전담하도록 하여 API 서버의 부하를 줄입니다.
-    task = tasks.process_session_github_indexing.delay(
-        attachment_id=attachment.attachment_id, repo_url=str(body.repo_url)
+    task = await asyncio.to_thread(
+        tasks.process_session_github_indexing.delay,
+        attachment_id=attachment.attachment_id,
+        repo_url=str(body.repo_url),
     )
 
     return {
@@ -338,7 +335,8 @@ async def attach_directory_to_session(
     )
 
     # 3. 압축된 ZIP 파일의 바이트(bytes)를 직접 Celery 워커에게 전달하여 인덱싱을 위임합니다.
-    task = tasks.process_session_directory_indexing.delay(
+    task = await asyncio.to_thread(
+        tasks.process_session_directory_indexing.delay,
         attachment_id=attachment.attachment_id,
         zip_content=zip_content_bytes,
         display_name=display_name,
@@ -360,7 +358,7 @@ async def attach_directory_to_session(
 )
 async def get_chat_sessions(
     current_user: schemas.UserInDB = Depends(dependencies.get_current_user),
-    session: AsyncSession = Depends(dependencies.get_db_session),
+    session: AsyncSession = Depends(dependencies.get_read_only_db_session),
 ) -> schemas.ChatSessionListResponse:
     """
     현재 인증된 사용자의 모든 채팅 세션 목록을 최신순으로 반환합니다.
@@ -393,7 +391,7 @@ async def get_chat_sessions(
 async def get_chat_history(
     session_id: str,
     current_user: schemas.UserInDB = Depends(dependencies.get_current_user),
-    session: AsyncSession = Depends(dependencies.get_db_session),
+    session: AsyncSession = Depends(dependencies.get_read_only_db_session),
 ) -> schemas.ChatHistoryResponse:
     """
     특정 세션 ID에 해당하는 대화 기록을 시간순으로 정렬하여 반환합니다.
@@ -427,7 +425,7 @@ async def get_chat_history(
 async def get_session_attachments(
     session_id: str,
     current_user: schemas.UserInDB = Depends(dependencies.get_current_user),
-    session: AsyncSession = Depends(dependencies.get_db_session),
+    session: AsyncSession = Depends(dependencies.get_read_only_db_session),
 ) -> schemas.SessionAttachmentListResponse:
     """
     지정한 세션의 임시 첨부파일 목록과 상태를 반환합니다.
@@ -450,13 +448,16 @@ async def get_session_attachments(
 )
 async def get_user_profile(
     current_user: schemas.UserInDB = Depends(dependencies.get_current_user),
-    session: AsyncSession = Depends(dependencies.get_db_session),
+    session: AsyncSession = Depends(dependencies.get_read_only_db_session),
 ) -> schemas.UserProfileResponse:
     """
     현재 사용자의 프로필 텍스트를 조회합니다.
     프로필 정보는 에이전트가 사용자에 대한 맥락(예: 역할, 전문 분야)을 파악하여
     더 개인화된 답변을 생성하는 데 사용됩니다.
 
+    사용자 캐시(`current_user`)는 프로세스마다 따로 존재하므로, 다른 워커에서 방금
+    저장한 프로필도 바로 보이도록 캐시 대신 DB에서 직접 조회합니다.
+
     Args:
         current_user: 인증된 사용자 정보.
         session: DB 작업을 위한 비동기 세션.
@@ -502,6 +503,9 @@ async def update_user_profile(
         user_id=current_user.user_id,
         profile_text=body.profile_text,
     )
+    # 커밋 이후에 캐시를 비워, 다음 요청이 변경된 프로필을 다시 읽어가도록 합니다.
+    await session.commit()
+    dependencies.invalidate_user_cache(current_user.username)
     logger.info(
         f"사용자 '{current_user.username}'의 프로필을 성공적으로 업데이트했습니다."
     )
@@ -524,36 +528,36 @@ async def delete_session_attachment(
         f"사용자 '{current_user.username}'가 세션 '{session_id}'의 첨부파일 ID {attachment_id} 삭제 시도."
     )
 
-    # 1. DB에서 삭제할 첨부파일 레코드를 조회합니다.
-    attachment = await db_session.get(models.SessionAttachment, attachment_id)
+    # 1. 소유자와 세션 조건을 함께 걸어 한 번의 `DELETE ... RETURNING`으로 삭제합니다.
+    #    [보안] 다른 사용자의 파일이거나 다른 세션의 파일이면 조건에 걸리지 않아 삭제되지 않으며,
+    #    존재 여부를 노출하지 않도록 404로 응답합니다.
+    #    `session_attachment_chunks` 테이블의 관련 청크들은 DB의 외래 키 제약 조건
+    #    (ON DELETE CASCADE)에 의해 자동으로 함께 삭제됩니다.
+    file_path = await db_session.scalar(
+        delete(models.SessionAttachment)
+        .where(
+            models.SessionAttachment.attachment_id == attachment_id,
+            models.SessionAttachment.user_id == current_user.user_id,
+            models.SessionAttachment.session_id == session_id,
+        )
+        .returning(models.SessionAttachment.file_path)
+    )
 
-    if not attachment:
+    if file_path is None:
         raise HTTPException(status_code=404, detail="Attachment not found.")
 
-    # 2. [보안] 요청한 사용자가 해당 첨부파일의 소유자인지, 그리고 올바른 세션에 속해 있는지 확인합니다.
-    #    이를 통해 다른 사용자의 파일을 삭제하는 것을 방지합니다.
-    if (
-        attachment.user_id != current_user.user_id
-        or attachment.session_id != session_id
-    ):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this attachment."
-        )
-
     try:
-        # 3. DB 레코드 삭제. `session_attachment_chunks` 테이블의 관련 청크들은
-        #    DB의 외래 키 제약 조건(ON DELETE CASCADE)에 의해 자동으로 함께 삭제됩니다.
-        await db_session.delete(attachment)
+        # 2. 삭제를 커밋합니다.
         await db_session.commit()
 
-        # 4. (선택적) 실제 파일 시스템에 저장된 물리적 파일을 삭제합니다.
+        # 3. (선택적) 실제 파일 시스템에 저장된 물리적 파일을 삭제합니다.
         #    GitHub 리포지토리처럼 외부 URL을 참조하는 경우는 삭제 대상에서 제외합니다.
-        if attachment.file_path and "github.com" not in attachment.file_path:
+        if file_path and "github.com" not in file_path:
             try:
-                file_to_delete = Path(attachment.file_path)
+                file_to_delete = Path(file_path)
                 if file_to_delete.exists():
                     os.remove(file_to_delete)
-                    logger.debug(f"로컬 파일 삭제 완료: {attachment.file_path}")
+                    logger.debug(f"로컬 파일 삭제 완료: {file_path}")
             except Exception as e:
                 # 물리적 파일 삭제에 실패하더라도 DB 레코드는 이미 삭제되었으므로,
                 # 오류를 로깅만 하고 작업을 계속 진행합니다.
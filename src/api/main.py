@@ -4,20 +4,25 @@ FastAPI 애플리케이션의 메인 진입점(Entrypoint)입니다.
 
 이 파일의 역할:
 - FastAPI 앱 인스턴스 생성: 애플리케이션의 기본 정보를 설정합니다.
+- 수명 주기(lifespan) 관리: 에이전트, Redis 풀 등 싱글톤 리소스를 시작 시 생성하고 종료 시 정리합니다.
 - 미들웨어(Middleware) 설정: 모든 API 요청에 공통적으로 적용될 로직(CORS, 로깅, 메트릭 수집 등)을 추가합니다.
 - API 라우터(Router) 등록: 각 기능별로 분리된 엔드포인트들을 모듈화하여 메인 앱에 연결합니다.
 - 상태 확인 엔드포인트 정의: API 서버가 정상적으로 실행 중인지 확인할 수 있는 경로를 제공합니다.
 """
 
 import time
+from contextlib import asynccontextmanager
 
+import redis.asyncio as aioredis
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # 내부 모듈 임포트
 from ..core.config import get_settings
 from ..core.logger import get_logger
+from . import dependencies
 from .endpoints import auth, chat
 
 # --- 초기 설정 ---
@@ -28,12 +33,32 @@ logger = get_logger(__name__)
 
 logger.info("FastAPI 애플리케이션 초기화를 시작합니다...")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱의 수명 주기 동안 공유할 싱글톤 리소스를 관리합니다.
+
+    무거운 에이전트(LLM, 임베딩 모델 등)와 Redis 클라이언트/커넥션 풀을 시작 시 한 번 생성하여
+    `app.state`에 보관하고, 의존성 함수는 요청마다 이를 그대로 반환합니다.
+    """
+    app.state.agent = dependencies.build_agent()
+    app.state.redis_pool = dependencies.build_redis_pool()
+    app.state.redis = aioredis.Redis(connection_pool=app.state.redis_pool)
+    yield
+    await app.state.redis.aclose()
+    await app.state.redis_pool.disconnect()
+
+
 # --- FastAPI 앱 인스턴스 생성 ---
 # 설정 파일(config.yml)에 정의된 앱 제목과 설명을 사용하여 FastAPI 앱을 생성합니다.
+# JSON 응답은 표준 `json` 대신 C로 구현된 orjson으로 직렬화합니다.
 app = FastAPI(
     title=settings.app.title,
     description=settings.app.description,
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 logger.info(f"'{settings.app.title}' v1.0.0 앱 인스턴스가 생성되었습니다.")
 
@@ -28,6 +28,7 @@ class TokenData(BaseModel):
     """JWT 토큰에 저장될 데이터 (페이로드)"""
 
     username: Optional[str] = None
+    exp: Optional[int] = None  # 만료 시각 (UNIX timestamp)
 
 
 class UserBase(BaseModel):
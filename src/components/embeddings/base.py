@@ -3,6 +3,7 @@
 임베딩 모델 컴포넌트의 기본 인터페이스를 정의하는 모듈입니다.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -46,6 +47,22 @@ class BaseEmbeddingModel(ABC):
         """
         pass
 
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        `embed_documents`의 비동기 버전입니다.
+
+        여러 배치의 임베딩 요청을 동시에 보낼 때(예: 워커의 인덱싱 파이프라인) 사용됩니다.
+        기본 구현은 동기 메서드를 스레드에서 실행하며, 비동기 클라이언트를 가진
+        구현체는 이 메서드를 재정의하여 네이티브 비동기 호출을 사용해야 합니다.
+
+        Args:
+            texts (List[str]): 임베딩할 텍스트(문서)의 리스트.
+
+        Returns:
+            List[List[float]]: 각 텍스트에 대한 임베딩 벡터의 리스트.
+        """
+        return await asyncio.to_thread(self.embed_documents, texts)
+
     @abstractmethod
     def embed_query(self, text: str) -> List[float]:
         """
@@ -89,6 +89,30 @@ class OllamaEmbedding(BaseEmbeddingModel):
             # 오류 발생 시, 상위 호출자에게 예외를 다시 전달하여 처리하도록 합니다.
             raise
 
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        `embed_documents`의 비동기 버전입니다.
+        `OllamaEmbeddings`의 네이티브 비동기 메서드(`aembed_documents`)에 위임하여,
+        여러 배치 요청을 하나의 이벤트 루프에서 동시에 처리할 수 있도록 합니다.
+
+        Args:
+            texts (List[str]): 임베딩할 텍스트의 리스트.
+
+        Returns:
+            List[List[float]]: 각 텍스트에 대한 임베딩 벡터의 리스트.
+        """
+        logger.debug(
+            f"'{self._model_name}' 모델로 {len(texts)}개 문서의 비동기 임베딩을 시작합니다."
+        )
+        try:
+            return await self.client.aembed_documents(texts)
+        except Exception as e:
+            logger.error(
+                f"'{self._model_name}' 모델로 문서 비동기 임베딩 중 오류 발생: {e}",
+                exc_info=True,
+            )
+            raise
+
     def embed_query(self, text: str) -> List[float]:
         """
         Ollama 모델을 사용하여 단일 텍스트(쿼리)를 임베딩 벡터로 변환합니다.
@@ -4,7 +4,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Any, Optional
+from typing import AsyncIterable, List, Sequence, Tuple, Dict, Any, Optional
 
 from langchain_core.documents import Document
 
@@ -64,3 +64,29 @@ class BaseVectorStore(ABC):
         k: int = 4,
     ) -> List[Dict[str, Any]]:
         pass
+
+    @abstractmethod
+    async def add_session_attachment_chunks(
+        self,
+        attachment_id: int,
+        batches: AsyncIterable[
+            List[Tuple[str, Dict[str, Any], Sequence[float]]]
+        ],
+    ) -> int:
+        """
+        첨부파일의 청크와 임베딩을 세션 KB에 저장하고, 첨부파일을 검색 가능 상태로 전환합니다.
+
+        같은 첨부파일에 대해 다시 호출되면(예: 태스크 재시도) 기존 청크를 대체해야 합니다.
+        적재 도중 실패하면 첨부파일을 'failed' 상태로 전환하고 예외를 다시 발생시켜야 합니다.
+        임베딩은 L2 정규화(단위 길이)된 상태로 전달됩니다.
+
+        Args:
+            attachment_id (int): 청크가 속한 첨부파일 ID.
+            batches (AsyncIterable[...]): `(chunk_text, metadata, embedding)` 튜플 리스트를
+                                         배치 단위로 생성하는 비동기 이터러블.
+                                         embedding은 float 리스트 또는 1차원 numpy 배열입니다.
+
+        Returns:
+            int: 저장된 청크 수.
+        """
+        pass
@@ -4,9 +4,12 @@ PostgreSQL과 `pgvector` 확장을 사용하는 벡터 저장소의 구체적인
 """
 
 import json
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterable, List, Sequence, Dict, Any, Optional, Tuple
 
+import numpy as np
+import orjson
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.database import AsyncSessionLocal
 from ...core.config import Settings
@@ -16,6 +19,52 @@ from ...core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# COPY로 적재할 session_attachment_chunks 컬럼 순서 (레코드 튜플 순서와 일치해야 함)
+_SESSION_CHUNK_COPY_COLUMNS = (
+    "attachment_id",
+    "chunk_text",
+    "embedding",
+    "extra_metadata",
+)
+
+# 세션 KB에서 자주 실행되는 고정 SQL은 모듈 로드 시 한 번만 `text()`로 생성합니다.
+# `session_attachment_chunks`와 `session_attachments` 테이블을 조인하여
+# 주어진 `session_id`에 속하고, 상태가 'temporary'(인덱싱 완료)인 청크만 검색 대상으로 합니다.
+# 임베딩 컬럼은 `halfvec(768)`이며 HNSW 인덱스가 `halfvec_ip_ops`로 생성되어 있으므로,
+# 인덱스를 타도록 쿼리 벡터도 `halfvec`으로 캐스팅하고 `<#>`(음의 내적)를 사용합니다.
+# 쿼리 벡터는 엔진에 등록된 pgvector 바이너리 코덱으로 인코딩되도록 numpy 배열로 바인딩합니다.
+_SEARCH_SESSION_CHUNKS_SQL = text(
+    """
+        SELECT 
+            c.chunk_id,
+            c.chunk_text, 
+            c.extra_metadata AS metadata,
+            c.embedding <#> CAST(:query_embedding AS halfvec(768)) AS distance
+        FROM 
+            session_attachment_chunks AS c
+        JOIN 
+            session_attachments AS a ON c.attachment_id = a.attachment_id
+        WHERE
+            a.session_id = :session_id
+            AND a.status = 'temporary' -- 인덱싱이 완료된 파일만
+        ORDER BY
+            distance
+        LIMIT :top_k
+        """
+)
+_DELETE_SESSION_CHUNKS_SQL = text(
+    "DELETE FROM session_attachment_chunks WHERE attachment_id = :id"
+)
+_MARK_ATTACHMENT_INDEXING_SQL = text(
+    "UPDATE session_attachments SET status = 'indexing' WHERE attachment_id = :id"
+)
+_MARK_ATTACHMENT_SEARCHABLE_SQL = text(
+    "UPDATE session_attachments SET status = 'temporary' WHERE attachment_id = :id"
+)
+_MARK_ATTACHMENT_FAILED_SQL = text(
+    "UPDATE session_attachments SET status = 'failed' WHERE attachment_id = :id"
+)
+
 
 class PgVectorStore(BaseVectorStore):
     """
@@ -63,11 +112,12 @@ class PgVectorStore(BaseVectorStore):
         Returns:
             List[Dict[str, Any]]: 검색된 문서 청크 정보의 리스트.
         """
-        # asyncpg는 배열 타입에 대한 prepared statement를 덜 최적화하므로,
-        # 벡터를 문자열로 캐스팅하여 SQL 쿼리에 직접 주입합니다.
-        query_embedding = self.embedding_model.embed_query(query)
-        query_vec_str = str(query_embedding)
-        logger.debug(f"벡터 검색 시작. k={k}, 문서 필터: {doc_ids_filter}")
+        # 쿼리 벡터는 엔진에 등록된 pgvector 바이너리 코덱으로 인코딩되도록
+        # 문자열이 아닌 numpy 배열로 바인딩합니다.
+        query_embedding = np.asarray(
+            self.embedding_model.embed_query(query), np.float32
+        )
+        logger.debug("벡터 검색 시작. k=%s, 문서 필터: %s", k, doc_ids_filter)
 
         # CTE(Common Table Expression)를 사용하여 쿼리를 구성합니다.
         # 1. `documents`와 `document_chunks` 테이블을 조인합니다.
@@ -87,7 +137,7 @@ class PgVectorStore(BaseVectorStore):
                     documents AS d ON c.doc_id = d.doc_id
                 """
         params = {
-            "query_embedding": query_vec_str,
+            "query_embedding": query_embedding,
             "top_k": k,
         }
 
@@ -116,7 +166,7 @@ class PgVectorStore(BaseVectorStore):
             ]
 
         logger.info(
-            f"벡터 검색 완료. {len(search_results)}개의 결과를 찾았습니다."
+            "벡터 검색 완료. %d개의 결과를 찾았습니다.", len(search_results)
         )
         return search_results
 
@@ -132,39 +182,30 @@ class PgVectorStore(BaseVectorStore):
 
         보안: 오직 `session_id`가 일치하는 청크만 검색합니다.
         """
-        query_embedding = self.embedding_model.embed_query(query)
-        query_vec_str = str(query_embedding)
+        query_embedding = np.asarray(
+            self.embedding_model.embed_query(query), np.float32
+        )
+        # 저장된 청크 임베딩은 단위 길이로 정규화되어 있으므로, 쿼리도 정규화하면
+        # 내적이 곧 코사인 유사도가 됩니다.
+        norm = np.linalg.norm(query_embedding)
+        if norm > 0:
+            query_embedding /= norm
         logger.debug(
-            f"세션 첨부파일(임시) 벡터 검색 시작. k={k}, session_id: {session_id}"
+            "세션 첨부파일(임시) 벡터 검색 시작. k=%s, session_id: %s",
+            k,
+            session_id,
         )
 
-        # `session_attachment_chunks`와 `session_attachments` 테이블을 조인하여
-        # 주어진 `session_id`에 속하고, 상태가 'temporary'(인덱싱 완료)인 청크만 검색 대상으로 합니다.
-        sql_query = """
-            SELECT 
-                c.chunk_id,
-                c.chunk_text, 
-                c.extra_metadata AS metadata,
-                c.embedding <-> :query_embedding AS distance
-            FROM 
-                session_attachment_chunks AS c
-            JOIN 
-                session_attachments AS a ON c.attachment_id = a.attachment_id
-            WHERE
-                a.session_id = :session_id
-                AND a.status = 'temporary' -- 인덱싱이 완료된 파일만
-            ORDER BY
-                distance
-            LIMIT :top_k
-        """
         params = {
-            "query_embedding": query_vec_str,
+            "query_embedding": query_embedding,
             "session_id": session_id,
             "top_k": k,
         }
 
         async with self.AsyncSessionLocal() as session:
-            result = await session.execute(text(sql_query), params)
+            result = await session.execute(
+                _SEARCH_SESSION_CHUNKS_SQL, params
+            )
             search_results = [
                 {
                     "chunk_text": row.chunk_text,
@@ -173,12 +214,125 @@ class PgVectorStore(BaseVectorStore):
                         if isinstance(row.metadata, str)
                         else row.metadata
                     ),
-                    "score": 1 - row.distance,  # 거리를 유사도 점수(0~1)로 변환
+                    # 단위 벡터 간 음의 내적을 코사인 유사도로 변환
+                    "score": -row.distance,
                 }
                 for row in result
             ]
 
         logger.info(
-            f"세션 첨부파일 벡터 검색 완료. {len(search_results)}개의 결과를 찾았습니다."
+            "세션 첨부파일 벡터 검색 완료. %d개의 결과를 찾았습니다.",
+            len(search_results),
         )
         return search_results
+
+    async def add_session_attachment_chunks(
+        self,
+        attachment_id: int,
+        batches: AsyncIterable[List[Tuple[str, Dict[str, Any], Sequence[float]]]],
+    ) -> int:
+        """
+        첨부파일의 청크를 `COPY ... FROM STDIN (FORMAT BINARY)`로 배치마다 적재하고,
+        첨부파일 상태를 'temporary'(검색 가능)로 전환합니다.
+
+        - 행마다 INSERT 문을 바인딩하는 대신, pgvector 바이너리 코덱으로 임베딩을
+          직렬화하여 COPY 스트림으로 전송합니다. (문자열 파싱 없음)
+        - 적재 전에 해당 첨부파일의 기존 청크를 삭제하여, 태스크가 재시도되어도
+          청크가 중복 저장되지 않도록 합니다. (첨부파일 단위 upsert)
+        - 삭제, 각 배치의 적재, 상태 업데이트는 각각 짧은 트랜잭션으로 커밋됩니다.
+          임베딩을 기다리는 동안에는 트랜잭션을 열어 두지 않아, 유휴 트랜잭션이
+          커넥션과 락을 오래 점유하지 않습니다. 적재 도중의 청크는 첨부파일이
+          'indexing' 상태이므로 검색 대상에서 제외됩니다.
+        - 적재 도중 실패하면 일부 적재된 청크를 삭제하고 첨부파일을 'failed'로 전환한 뒤
+          예외를 다시 발생시킵니다.
+        - 검색은 내적(`<#>`) 기반이므로, 임베딩은 단위 길이로 정규화된 상태로 전달되어야 합니다.
+
+        Args:
+            attachment_id (int): 청크가 속한 첨부파일 ID.
+            batches (AsyncIterable[...]): `(chunk_text, metadata, embedding)` 튜플 리스트를
+                                         배치 단위로 생성하는 비동기 이터러블.
+                                         embedding은 float 리스트 또는 1차원 numpy 배열입니다.
+
+        Returns:
+            int: 저장된 청크 수.
+        """
+        stored = 0
+        async with self.AsyncSessionLocal() as session:
+            # 1. 첨부파일을 검색 대상에서 제외하고, 이전 시도에서 남은 청크를 삭제합니다.
+            async with session.begin():
+                await session.execute(
+                    _MARK_ATTACHMENT_INDEXING_SQL, {"id": attachment_id}
+                )
+                await session.execute(
+                    _DELETE_SESSION_CHUNKS_SQL, {"id": attachment_id}
+                )
+
+            # 2. 임베딩이 끝난 배치마다 별도의 트랜잭션으로 COPY합니다.
+            #    도중에 실패하면 일부만 적재된 청크를 지우고 'failed'로 표시한 뒤
+            #    예외를 다시 발생시킵니다. ('indexing' 상태로 남겨두지 않습니다.)
+            try:
+                async for batch in batches:
+                    await self._copy_session_chunk_batch(
+                        session, attachment_id, batch
+                    )
+                    stored += len(batch)
+                    logger.debug(
+                        "첨부파일 %s: 청크 %d개 적재 완료", attachment_id, stored
+                    )
+            except Exception:
+                await self._mark_attachment_failed(session, attachment_id)
+                raise
+
+            # 3. 모든 청크가 적재된 뒤에 검색 가능 상태로 전환합니다.
+            async with session.begin():
+                await session.execute(
+                    _MARK_ATTACHMENT_SEARCHABLE_SQL, {"id": attachment_id}
+                )
+
+        logger.info(
+            f"첨부파일 {attachment_id}의 청크 {stored}개를 세션 KB에 저장했습니다."
+        )
+        return stored
+
+    async def _copy_session_chunk_batch(
+        self,
+        session: AsyncSession,
+        attachment_id: int,
+        batch: List[Tuple[str, Dict[str, Any], Sequence[float]]],
+    ) -> None:
+        """청크 한 배치를 별도의 트랜잭션에서 `COPY`로 적재합니다."""
+        async with session.begin():
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            # halfvec 바이너리 코덱은 커넥션 생성 시 엔진 이벤트에서 이미 등록되어 있습니다.
+            await raw_connection.driver_connection.copy_records_to_table(
+                "session_attachment_chunks",
+                records=[
+                    (
+                        attachment_id,
+                        chunk_text,
+                        embedding,
+                        orjson.dumps(metadata).decode(),
+                    )
+                    for chunk_text, metadata, embedding in batch
+                ],
+                columns=_SESSION_CHUNK_COPY_COLUMNS,
+            )
+
+    async def _mark_attachment_failed(
+        self, session: AsyncSession, attachment_id: int
+    ) -> None:
+        """적재에 실패한 첨부파일의 청크를 삭제하고 상태를 'failed'로 전환합니다."""
+        try:
+            async with session.begin():
+                await session.execute(
+                    _DELETE_SESSION_CHUNKS_SQL, {"id": attachment_id}
+                )
+                await session.execute(
+                    _MARK_ATTACHMENT_FAILED_SQL, {"id": attachment_id}
+                )
+        except Exception:
+            # 원래 예외를 가리지 않도록 정리 실패는 기록만 합니다.
+            logger.exception(
+                f"첨부파일 {attachment_id}의 실패 상태 기록에 실패했습니다."
+            )
@@ -9,7 +9,7 @@ from ...components.tools.base import BaseTool
 from ...components.vector_stores.base import BaseVectorStore
 from .. import prompts
 from ..logger import get_logger
-from .state import AgentState
+from .state import AGENT_CHAT_HISTORY_LIMIT, AgentState
 
 logger = get_logger(__name__)
 
@@ -41,8 +41,8 @@ class AgentNodes:
         """최근 대화 기록을 바탕으로 간단한 컨텍스트를 구축합니다."""
         logger.debug("--- [Node: build_hybrid_context] ---")
 
-        # TODO: 컨텍스트에 포함할 대화 개수를 설정 가능하도록 변경 (현재 10개로 고정)
-        recent_turns = state.get("chat_history", [])[-10:]
+        chat_history = state.get("chat_history", [])
+        recent_turns = chat_history[-AGENT_CHAT_HISTORY_LIMIT:]
         history_str = (
             "\n".join([f"{msg['role']}: {msg['content']}" for msg in recent_turns])
             if recent_turns
@@ -73,7 +73,11 @@ class AgentNodes:
                 return {"tool_outputs": {"rag_chunks": []}}
 
             # 검색 정확도를 높이기 위해 결과 리랭킹
-            reranked_docs = self.reranker.rerank(question, docs)
+            # 리랭커(예: Cross-Encoder)는 CPU를 오래 점유하는 동기 호출이므로,
+            # 이벤트 루프를 막지 않도록 별도 스레드에서 실행합니다.
+            reranked_docs = await asyncio.to_thread(
+                self.reranker.rerank, question, docs
+            )
 
             # 최종적으로 사용할 Top-K 문서 선정
             final_docs = reranked_docs[: state["top_k"]]
@@ -81,7 +85,7 @@ class AgentNodes:
             return {"tool_outputs": {"rag_chunks": final_docs}}
 
         except Exception as e:
-            logger.error(f"RAG tool 실행 중 오류 발생: {e}")
+            logger.error("RAG tool 실행 중 오류 발생: %s", e)
             return {"tool_outputs": {"rag_chunks": []}}
 
     async def generate_final_answer(self, state: AgentState) -> Dict[str, Any]:
@@ -109,8 +113,9 @@ class AgentNodes:
         )
 
         # LLM을 호출하여 답변 스트리밍
-        full_answer = ""
+        # 조각을 리스트에 모은 뒤 한 번에 합쳐, 응답 길이에 비례하는 반복 복사를 피합니다.
+        answer_parts = []
         async for chunk in self.llm.stream([HumanMessage(content=prompt)], config={}):
-            full_answer += chunk.content
+            answer_parts.append(chunk.content)
 
-        return {"answer": full_answer}
+        return {"answer": "".join(answer_parts)}
@@ -2,6 +2,10 @@
 
 from typing import TypedDict, List, Dict, Any, Literal, Optional
 
+# 에이전트가 컨텍스트로 사용하는 최근 대화 메시지 수.
+# `build_hybrid_context` 노드와, 에이전트 입력을 만들 때 DB에서 읽는 대화 수가 함께 이 값을 따릅니다.
+AGENT_CHAT_HISTORY_LIMIT = 10
+
 
 class AgentState(TypedDict):
     """
@@ -16,7 +20,7 @@ class AgentState(TypedDict):
     doc_ids_filter: Optional[
         List[str]
     ]  # RAG 검색 범위를 특정 문서 ID로 제한할 때 사용
-    chat_history: List[Dict[str, str]]  # 전체 대화 기록
+    chat_history: List[Dict[str, str]]  # 최근 대화 기록 (시간순)
     user_profile: Optional[
         str
     ]  # 사용자 프로필 정보 (개인화된 답변 생성에 사용)
@@ -138,6 +138,11 @@ class EmbeddingSettings(BaseModel):
     api_base: Optional[str] = Field(
         None, description="임베딩 API의 기본 URL (Ollama 등)"
     )
+    concurrency: int = Field(
+        4,
+        ge=1,
+        description="인덱싱 시 동시에 보낼 임베딩 배치 요청 수 (임베딩 서버의 병렬 처리 능력에 맞춰 조정)",
+    )
 
 
 class VectorStoreSettings(BaseModel):
@@ -187,6 +192,33 @@ class Settings(BaseSettings):
     )
     POSTGRES_PORT: int = Field(5432, description="PostgreSQL 포트 번호")
 
+    # 데이터베이스 커넥션 풀 설정 (프로세스당 적용)
+    DB_POOL_SIZE: int = Field(
+        20, ge=1, description="커넥션 풀에 유지할 기본 연결 수"
+    )
+    DB_MAX_OVERFLOW: int = Field(
+        40, ge=0, description="요청 폭주 시 기본 풀 크기를 넘어 추가로 허용할 연결 수"
+    )
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        3600, description="이 시간(초)보다 오래된 연결은 재생성합니다"
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        512,
+        ge=0,
+        description="연결당 캐싱할 prepared statement 수 (PgBouncer 트랜잭션 모드에서는 0)",
+    )
+
+    # 마이그레이션의 인덱스 빌드 설정 (미지정 시 서버 기본값 사용)
+    MIGRATION_MAINTENANCE_WORK_MEM: Optional[str] = Field(
+        None,
+        description="HNSW 등 대용량 인덱스 빌드 시 사용할 maintenance_work_mem (예: '1GB')",
+    )
+    MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS: Optional[int] = Field(
+        None,
+        ge=0,
+        description="인덱스 빌드 시 사용할 max_parallel_maintenance_workers",
+    )
+
     # Redis 연결 정보 (Celery 브로커 및 결과 백엔드용)
     REDIS_HOST: str = Field("localhost", description="Redis 호스트 주소")
     REDIS_PORT: int = Field(6379, description="Redis 포트 번호")
@@ -200,6 +232,11 @@ class Settings(BaseSettings):
     AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(
         60 * 24 * 7, description="액세스 토큰 만료 시간(분). 예: 7일"
     )
+    AUTH_PASSWORD_HASH_WORKERS: Optional[int] = Field(
+        None,
+        ge=1,
+        description="비밀번호 해싱/검증 전용 스레드 수 (미지정 시 CPU 코어 수). Argon2id는 작업당 64MiB를 사용합니다.",
+    )
 
     # 외부 서비스 API 키 (선택 사항)
     # 필요한 서비스의 API 키만 .env 파일에 추가하여 사용합니다.
@@ -227,6 +264,12 @@ class Settings(BaseSettings):
         None, description="Ollama 서비스의 기본 URL"
     )
 
+    # 워커 인덱싱 튜닝
+    INDEXING_LOAD_THREADS: Optional[int] = Field(
+        None,
+        description="리포지토리 인덱싱 시 파일 로드/분할에 사용할 스레드 수 (미지정 시 CPU 코어 수)",
+    )
+
     # --- config.yml 또는 기본값으로 관리되는 구조화된 설정 ---
     app: AppSettings = Field(
         default_factory=AppSettings, description="앱 일반 설정"
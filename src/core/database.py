@@ -7,8 +7,13 @@ SQLAlchemy를 사용하여 비동기 데이터베이스 엔진과 세션 팩토
 이 모듈에서 생성된 `AsyncSessionLocal`은 의존성 주입을 통해 API 엔드포인트에서 사용됩니다.
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from .config import get_settings
 from .logger import get_logger
@@ -23,16 +28,65 @@ logger.info("데이터베이스 엔진 및 세션 설정을 시작합니다...")
 engine = create_async_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # 커넥션 풀에서 연결을 가져올 때마다 연결 유효성 검사를 수행하여, DB 연결이 끊어지는 문제 방지
+    # 동시 요청이 몰려도 풀 대기(QueuePool timeout)에 걸리지 않도록 풀 크기를 설정으로 지정합니다.
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,  # 오래된 연결이 서버/프록시에서 끊기기 전에 재생성
+    # 모듈 수준에서 한 번만 만든 고정 SQL이 연결마다 PREPARE를 재사용하도록 캐시 크기를 지정합니다.
+    # (asyncpg의 statement 캐시와 SQLAlchemy asyncpg 어댑터의 prepared statement 캐시)
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
     echo=False,  # True로 설정하면 실행되는 모든 SQL 쿼리를 로깅합니다 (디버깅용)
 )
 
+
+async def _register_vector_codecs_if_available(connection) -> None:
+    """`vector` 확장이 설치된 경우에만 pgvector 코덱을 등록합니다."""
+    has_vector_extension = await connection.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector')"
+    )
+    if not has_vector_extension:
+        # 마이그레이션(`alembic upgrade head`)이 확장을 만들기 전에 열린 커넥션입니다.
+        # 벡터와 무관한 쿼리는 계속 처리할 수 있도록 커넥션 자체는 실패시키지 않습니다.
+        logger.warning(
+            "pgvector 확장이 설치되지 않아 벡터 코덱을 등록하지 않았습니다. "
+            "마이그레이션을 먼저 실행하세요."
+        )
+        return
+    await register_vector(connection)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codecs(dbapi_connection, connection_record) -> None:
+    """
+    새 DB 커넥션이 생성될 때 한 번만 pgvector(vector/halfvec) 바이너리 코덱을 등록합니다.
+
+    코덱 등록은 asyncpg의 statement 캐시를 초기화하므로, 요청마다가 아니라
+    커넥션 생성 시점에만 수행합니다. 등록 이후에는 이 엔진을 사용하는 모든 쿼리에서
+    벡터 파라미터를 문자열이 아닌 float 리스트/numpy 배열로 바인딩해야 합니다.
+    """
+    dbapi_connection.run_async(_register_vector_codecs_if_available)
+
+
 # 비동기 세션을 생성하는 팩토리 클래스입니다.
 # FastAPI의 Depends()와 함께 사용되어 각 요청마다 독립적인 DB 세션을 제공합니다.
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,  # commit 후에도 ORM 객체의 상태를 유지하여, 객체에 계속 접근할 수 있도록 함
     autoflush=False,  # 세션이 자동으로 flush되지 않도록 설정. 수동으로 flush를 제어
 )
 
+# 조회 전용 세션 팩토리입니다. 같은 커넥션 풀을 공유하되 AUTOCOMMIT 격리 수준으로 실행되어,
+# SELECT만 수행하는 요청에서 BEGIN/COMMIT(ROLLBACK) 왕복이 발생하지 않습니다.
+# 쓰기 작업에는 사용하지 마세요. (각 문장이 즉시 커밋되어 원자성이 보장되지 않습니다.)
+ReadOnlySessionLocal = async_sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 logger.info("데이터베이스 엔진 및 세션 팩토리가 성공적으로 생성되었습니다.")
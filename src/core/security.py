@@ -5,8 +5,10 @@
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
+import orjson
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -17,9 +19,32 @@ settings = get_settings()
 
 
 # --- 1. 비밀번호 해싱 설정 ---
-# `bcrypt`는 현재 산업 표준으로 널리 사용되는 안전한 해싱 알고리즘입니다.
-# 키 스트레칭(key stretching)을 지원하여 브루트포스 공격에 대한 저항력을 높입니다.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 새 비밀번호는 메모리 하드(memory-hard) 해시인 Argon2id로 저장합니다.
+# 파라미터는 OWASP 권장값(m=64MiB, t=3, p=2)으로, bcrypt(cost 12)보다 검증이 빠르면서
+# GPU 기반 대입 공격에 대한 저항력은 더 높습니다.
+# 기존 bcrypt 해시도 그대로 검증되며, `deprecated="auto"`에 따라 로그인에 성공하면
+# `verify_and_update_password`가 Argon2id로 재해싱한 값을 돌려줍니다.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=3,
+    argon2__memory_cost=65536,
+    argon2__parallelism=2,
+)
+
+
+# 같은 페이로드로 발급한 JWT를 짧게 재사용하여, 연속 로그인 시 서명을 반복하지 않도록 합니다.
+# 재사용된 토큰도 최소 1분 이상의 유효 기간이 남도록 TTL을 만료 시간보다 짧게 제한합니다.
+# 이 함수는 이벤트 루프(단일 스레드)에서만 호출되므로 별도의 락을 두지 않습니다.
+_ISSUED_TOKEN_TTL_SECONDS = min(
+    15, settings.AUTH_ACCESS_TOKEN_EXPIRE_MINUTES * 60 - 60
+)
+_issued_token_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=10_000, ttl=_ISSUED_TOKEN_TTL_SECONDS)
+    if _ISSUED_TOKEN_TTL_SECONDS > 0
+    else None
+)
 
 
 # --- 2. 보안 유틸리티 함수 ---
@@ -30,8 +55,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """비밀번호를 검증하고, 저장된 해시가 오래된 방식이면 새 해시를 함께 반환합니다.
+
+    Returns:
+        Tuple[bool, Optional[str]]: (일치 여부, 교체해야 할 새 해시 또는 None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
-    """평문 비밀번호를 bcrypt 해시로 변환합니다."""
+    """평문 비밀번호를 Argon2id 해시로 변환합니다."""
     return pwd_context.hash(password)
 
 
@@ -48,6 +84,16 @@ def create_access_token(
     Returns:
         str: 생성된 JWT 문자열.
     """
+    # 기본 만료 시간으로 발급하는 경우, 최근에 같은 페이로드로 서명한 토큰을 재사용합니다.
+    # 페이로드에는 리스트처럼 해시할 수 없는 값(예: 'permission_groups')이 포함되므로,
+    # 키를 정렬해 직렬화한 바이트를 캐시 키로 사용합니다.
+    cache_key = None
+    if expires_delta is None and _issued_token_cache is not None:
+        cache_key = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        cached_token = _issued_token_cache.get(cache_key)
+        if cached_token is not None:
+            return cached_token
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -61,6 +107,8 @@ def create_access_token(
     encoded_jwt = jwt.encode(
         to_encode, settings.AUTH_SECRET_KEY, algorithm=settings.AUTH_ALGORITHM
     )
+    if cache_key is not None:
+        _issued_token_cache[cache_key] = encoded_jwt
     return encoded_jwt
 
 
@@ -88,7 +136,7 @@ def verify_token(token: str, credentials_exception: Exception) -> TokenData:
         if username is None:
             raise credentials_exception
 
-        token_data = TokenData(username=username)
+        token_data = TokenData(username=username, exp=payload.get("exp"))
     except JWTError:
         raise credentials_exception
     return token_data
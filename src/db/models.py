@@ -31,7 +31,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 
 
 class Base(DeclarativeBase):
@@ -209,22 +209,33 @@ class ChatHistory(Base):
     """
 
     __tablename__ = "chat_history"
+    __table_args__ = (
+        # 세션 대화 기록 조회(session_id 필터 + created_at 정렬)와
+        # 사용자별 최근 활동 조회를 인덱스 스캔 + LIMIT만으로 처리하기 위한 복합 인덱스.
+        # 선두 컬럼이 같은 단일 컬럼 인덱스(user_id, session_id)를 대체합니다.
+        sa.Index("ix_chat_history_session_created", "session_id", "created_at"),
+        sa.Index(
+            "ix_chat_history_user_created",
+            "user_id",
+            sa.text("created_at DESC"),
+        ),
+    )
 
     message_id: Mapped[int] = mapped_column(
         BIGINT,
-        Identity(),
+        # 턴마다 INSERT가 발생하는 쓰기 집중 테이블이므로, 시퀀스 값을 1,000개씩
+        # 미리 할당받아 동시 INSERT 간의 시퀀스 경합을 줄입니다.
+        Identity(cache=1000),
         primary_key=True,
         comment="메시지 고유 ID (PK, 자동 증가)",
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.user_id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
         comment="메시지를 작성한 사용자 ID (FK to users.user_id)",
     )
     session_id: Mapped[str] = mapped_column(
         ForeignKey("sessions.session_id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
         comment="채팅 세션 ID. 동일한 대화를 그룹화하는 데 사용됩니다.",
     )
@@ -264,6 +275,15 @@ class SessionAttachment(Base):
     """
 
     __tablename__ = "session_attachments"
+    __table_args__ = (
+        # 세션 KB 검색에서 인덱싱이 완료된('temporary') 첨부파일만 찾기 위한 부분 인덱스.
+        sa.Index(
+            "ix_session_attachments_session_temporary",
+            "session_id",
+            "attachment_id",
+            postgresql_where=sa.text("status = 'temporary'"),
+        ),
+    )
 
     attachment_id: Mapped[int] = mapped_column(
         BIGINT, Identity(), primary_key=True, comment="첨부파일 고유 ID (PK)"
@@ -322,7 +342,10 @@ class SessionAttachmentChunk(Base):
     __tablename__ = "session_attachment_chunks"
 
     chunk_id: Mapped[int] = mapped_column(
-        BIGINT, Identity(), primary_key=True, comment="임시 청크의 고유 ID (PK)"
+        BIGINT,
+        Identity(cache=1000),  # 대량 적재 시 시퀀스 경합 감소
+        primary_key=True,
+        comment="임시 청크의 고유 ID (PK)",
     )
     attachment_id: Mapped[int] = mapped_column(
         ForeignKey("session_attachments.attachment_id", ondelete="CASCADE"),
@@ -335,9 +358,9 @@ class SessionAttachmentChunk(Base):
     )
     embedding: Mapped[List[float]] = mapped_column(
         "embedding",
-        Vector(768),  # 하드코딩 주의
+        HALFVEC(768),  # 하드코딩 주의
         nullable=False,
-        comment="텍스트에 대한 벡터 임베딩 (pgvector 타입)",
+        comment="텍스트에 대한 벡터 임베딩 (pgvector halfvec 타입)",
     )
     extra_metadata: Mapped[Dict[str, any]] = mapped_column(
         JSONB, nullable=True, comment="청크 관련 추가 메타데이터 (JSONB 형식)"
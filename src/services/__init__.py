@@ -3,9 +3,9 @@
 이 패키지는 API 계층과 데이터 접근 계층 사이의 중간 다리 역할을 합니다.
 """
 
-from . import chat_service
+from . import chat_service, user_service
 
 # `__all__` 변수는 `from services import *` 구문을 사용할 때
 # 외부에 노출할 모듈의 목록을 명시적으로 정의합니다.
 # 이를 통해 패키지의 공개 API를 명확히 하고, 불필요한 모듈이 임포트되는 것을 방지합니다.
-__all__ = ["chat_service"]
+__all__ = ["chat_service", "user_service"]
@@ -13,16 +13,17 @@
 
 from __future__ import annotations
 
-import json
 from typing import AsyncGenerator, Optional, Dict, Any
 
+import orjson
 from fastapi import BackgroundTasks, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..api import schemas
 from ..core.agent import Orchestrator
+from ..core.agent.state import AGENT_CHAT_HISTORY_LIMIT
 from ..core.logger import get_logger
 from ..db import models
 from ..db.models import Session
@@ -79,14 +80,26 @@ async def build_stateful_agent_inputs(
     except Exception as e:
         logger.warning(f"세션 컨텍스트 로드 실패 (기본값 사용): {e}")
 
-    # 2. 대화 기록 로드 (기존 로직 유지)
-    chat_history_models = await fetch_chat_history(
-        db_session=db_session, user_id=user_id, session_id=session_id
+    # 2. 최근 대화 기록 로드
+    #    (session_id, created_at) 인덱스를 역순으로 읽어 최근 N개만 가져온 뒤 시간순으로 되돌립니다.
+    #    같은 시각에 저장된 메시지(질문/답변)의 순서가 바뀌지 않도록 message_id로 동순위를 정합니다.
+    #    에이전트는 `build_hybrid_context`가 사용하는 만큼만 필요하므로 그 이상은 읽지 않습니다.
+    #    에이전트는 dict만 필요하므로 Pydantic 모델을 거치지 않고 행을 바로 dict로 변환합니다.
+    history_stmt = (
+        select(models.ChatHistory.role, models.ChatHistory.content)
+        .where(
+            models.ChatHistory.user_id == user_id,
+            models.ChatHistory.session_id == session_id,
+        )
+        .order_by(
+            models.ChatHistory.created_at.desc(),
+            models.ChatHistory.message_id.desc(),
+        )
+        .limit(AGENT_CHAT_HISTORY_LIMIT)
     )
-    chat_history = [
-        {"role": msg.role, "content": msg.content}
-        for msg in chat_history_models
-    ]
+    history_result = await db_session.execute(history_stmt)
+    chat_history = [dict(row) for row in history_result.mappings()]
+    chat_history.reverse()
 
     inputs = {
         "question": query,
@@ -107,7 +120,7 @@ async def stream_agent_response(
     background_tasks: BackgroundTasks,
     user_id: int,
     session_id: str,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     에이전트의 응답을 스트리밍하고, 클라이언트에게 SSE(Server-Sent Events) 형식으로 전송합니다.
 
@@ -124,7 +137,7 @@ async def stream_agent_response(
         session_id (str): 현재 채팅 세션의 ID.
 
     Yields:
-        str: SSE 형식의 이벤트 문자열 (예: 'data: {"event": "token", "data": "hello"}\n\n').
+        bytes: SSE 형식의 이벤트 바이트열 (예: b'data: {"event":"token","data":{...}}\n\n').
     """
     final_answer = ""
     final_state: Optional[Dict[str, Any]] = None
@@ -143,7 +156,9 @@ async def stream_agent_response(
             kind = event.get("event")
             if not stream_started:
                 logger.debug(
-                    f"세션 '{session_id}'의 첫 이벤트를 수신했습니다: {kind}"
+                    "세션 '%s'의 첫 이벤트를 수신했습니다: %s",
+                    session_id,
+                    kind,
                 )
                 stream_started = True
 
@@ -152,7 +167,7 @@ async def stream_agent_response(
             if kind == "on_node_start":
                 node_name = event.get("name")
                 if node_name in TOOL_NODES:
-                    logger.debug(f"Tool Node Start: {node_name}")
+                    logger.debug("Tool Node Start: %s", node_name)
                     yield _build_sse_payload("tool_start", {"name": node_name})
                     # 도구가 실행되었으므로, 다음에 오는 LLM 응답은 새 메시지로 처리해야 함을 표시합니다.
                     force_new_message_after_tool = True
@@ -162,7 +177,7 @@ async def stream_agent_response(
             elif kind == "on_node_end":
                 node_name = event.get("name")
                 if node_name in TOOL_NODES:
-                    logger.debug(f"Tool Node End: {node_name}")
+                    logger.debug("Tool Node End: %s", node_name)
                     yield _build_sse_payload("tool_end", {"name": node_name})
 
             # 'on_chat_model_stream': LLM이 스트리밍으로 토큰을 생성할 때 발생합니다.
@@ -185,15 +200,18 @@ async def stream_agent_response(
                             False  # 플래그는 한 번만 사용 후 초기화
                         )
 
-                    yield _build_sse_payload(
-                        "token",
-                        {"chunk": content, "new_message": new_message_flag},
+                    yield (
+                        _SSE_TOKEN_PREFIX
+                        + orjson.dumps(
+                            {"chunk": content, "new_message": new_message_flag}
+                        )
+                        + _SSE_FRAME_SUFFIX
                     )
 
             # 'on_graph_end': 에이전트(그래프)의 모든 실행이 완료되었을 때 발생합니다.
             elif kind == "on_graph_end":
                 logger.debug(
-                    f"세션 '{session_id}'의 그래프 실행이 종료되었습니다."
+                    "세션 '%s'의 그래프 실행이 종료되었습니다.", session_id
                 )
                 final_state = event.get("data", {}).get("output")
                 if final_state and isinstance(final_state, dict):
@@ -203,7 +221,7 @@ async def stream_agent_response(
                     rag_chunks = tool_outputs.get("rag_chunks", [])
                     sources = [schemas.Source(**chunk) for chunk in rag_chunks]
                     if sources:
-                        sources_dict = [s.dict() for s in sources]
+                        sources_dict = [s.model_dump() for s in sources]
                         logger.info(
                             f"세션 '{session_id}'에 대해 {len(sources)}개의 소스를 찾았습니다."
                         )
@@ -213,7 +231,7 @@ async def stream_agent_response(
         logger.info(
             f"세션 '{session_id}'의 스트리밍이 성공적으로 완료되었습니다."
         )
-        yield _build_sse_payload("end", "Stream ended")
+        yield _SSE_END_FRAME
 
     except Exception as exc:
         logger.error(
@@ -243,12 +261,20 @@ async def stream_agent_response(
         )
 
 
-def _build_sse_payload(event: str, data: Any) -> str:
-    """SSE(Server-Sent Events) 규격에 맞는 `data: {...}` 형식의 문자열을 생성합니다."""
+def _build_sse_payload(event: str, data: Any) -> bytes:
+    """SSE(Server-Sent Events) 규격에 맞는 `data: {...}` 형식의 바이트열을 생성합니다."""
     # 클라이언트(브라우저)와 약속된 JSON 구조로 데이터를 감쌉니다.
-    payload = json.dumps({"event": event, "data": data})
+    # orjson은 UTF-8 바이트를 바로 반환하므로, ASGI 계층에서 다시 인코딩하지 않습니다.
+    payload = orjson.dumps({"event": event, "data": data})
     # SSE 형식은 "data: "로 시작하고 "\n\n"으로 끝나야 합니다.
-    return f"data: {payload}\n\n"
+    return b"data: " + payload + b"\n\n"
+
+
+# 토큰 이벤트는 LLM 토큰마다 전송되므로, 고정된 앞뒤 부분을 미리 인코딩해 두고
+# 가변 데이터만 직렬화하여 이어 붙입니다. (`_build_sse_payload("token", ...)`와 같은 형식)
+_SSE_TOKEN_PREFIX = b'data: {"event":"token","data":'
+_SSE_FRAME_SUFFIX = b"}\n\n"
+_SSE_END_FRAME = _build_sse_payload("end", "Stream ended")
 
 
 async def create_session_attachment(
@@ -263,17 +289,20 @@ async def create_session_attachment(
     (신규) SessionAttachment DB 레코드를 생성하고 반환합니다.
     """
     try:
-        new_attachment = models.SessionAttachment(
-            session_id=session_id,
-            user_id=user_id,
-            file_name=file_name,
-            file_path=file_path,
-            status=status,
+        # `INSERT ... RETURNING`으로 DB가 생성한 ID와 기본값(created_at 등)까지 한 번에
+        # 받아오므로, 커밋 후 `refresh()`로 다시 SELECT할 필요가 없습니다.
+        new_attachment = await db_session.scalar(
+            insert(models.SessionAttachment)
+            .values(
+                session_id=session_id,
+                user_id=user_id,
+                file_name=file_name,
+                file_path=file_path,
+                status=status,
+            )
+            .returning(models.SessionAttachment)
         )
-        db_session.add(new_attachment)
         await db_session.commit()
-        # commit 후, DB에 의해 자동 생성된 ID와 같은 최신 상태를 객체에 반영합니다.
-        await db_session.refresh(new_attachment)
         logger.debug(
             f"DB 레코드 생성 완료 (Attachment ID: {new_attachment.attachment_id})"
         )
@@ -351,8 +380,14 @@ async def fetch_session_attachments(
     db_session: AsyncSession, user_id: int, session_id: str
 ) -> list[schemas.SessionAttachmentResponse]:
     """특정 세션에 첨부된 파일 목록을 상태와 함께 반환합니다."""
+    # ORM 엔티티 전체(file_path 등) 대신 응답에 필요한 컬럼만 조회합니다.
     stmt = (
-        select(models.SessionAttachment)
+        select(
+            models.SessionAttachment.attachment_id,
+            models.SessionAttachment.file_name,
+            models.SessionAttachment.status,
+            models.SessionAttachment.created_at,
+        )
         .where(
             models.SessionAttachment.user_id == user_id,
             models.SessionAttachment.session_id == session_id,
@@ -360,10 +395,10 @@ async def fetch_session_attachments(
         .order_by(models.SessionAttachment.created_at.desc())
     )
     result = await db_session.execute(stmt)
-    attachments = result.scalars().all()
+    # DB에서 읽은 타입이 이미 스키마와 일치하므로 검증 없이 모델을 구성합니다.
     return [
-        schemas.SessionAttachmentResponse.model_validate(att)
-        for att in attachments
+        schemas.SessionAttachmentResponse.model_construct(**row)
+        for row in result.mappings()
     ]
 
 
@@ -446,7 +481,10 @@ async def fetch_user_sessions(
     )
 
     result = await db_session.execute(stmt)
-    sessions = [schemas.ChatSession(**row._asdict()) for row in result]
+    # DB에서 읽은 타입이 이미 스키마와 일치하므로 검증 없이 모델을 구성합니다.
+    sessions = [
+        schemas.ChatSession.model_construct(**row) for row in result.mappings()
+    ]
     logger.debug(
         f"사용자 '{user_id}'에 대해 {len(sessions)}개의 세션을 조회했습니다."
     )
@@ -460,8 +498,13 @@ async def fetch_chat_history(
     logger.debug(
         f"사용자 '{user_id}'의 세션 '{session_id}' 대화 기록 조회를 시작합니다."
     )
+    # ORM 엔티티를 만들지 않고 응답에 필요한 컬럼만 조회합니다.
     stmt = (
-        select(models.ChatHistory)
+        select(
+            models.ChatHistory.role,
+            models.ChatHistory.content,
+            models.ChatHistory.created_at,
+        )
         .where(
             models.ChatHistory.user_id == user_id,
             models.ChatHistory.session_id == session_id,
@@ -469,10 +512,11 @@ async def fetch_chat_history(
         .order_by(models.ChatHistory.created_at.asc())
     )
     result = await db_session.execute(stmt)
-    # SQLAlchemy 모델 객체(row)를 Pydantic 스키마(ChatMessageInDB)로 변환합니다.
-    # .from_orm()은 Pydantic V2의 기능으로, 데이터 유효성 검사와 직렬화를 수행합니다.
+    # 조회 결과(RowMapping)를 Pydantic 스키마(ChatMessageInDB)로 변환합니다.
+    # 폐기 예정(deprecated)인 `.from_orm()`의 ORM → 스키마 검증 과정 없이 모델을 구성합니다.
     messages = [
-        schemas.ChatMessageInDB.from_orm(row) for row in result.scalars()
+        schemas.ChatMessageInDB.model_construct(**row)
+        for row in result.mappings()
     ]
     logger.debug(
         f"세션 '{session_id}'에서 {len(messages)}개의 메시지를 조회했습니다."
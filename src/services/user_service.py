@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 계정과 관련된 데이터베이스 조회 로직을 담당하는 서비스 계층입니다.
+
+인증 의존성(`get_current_user`)과 로그인 엔드포인트가 모두 이 모듈의 조회 함수를 사용하므로,
+사용자 조회 쿼리는 이곳 한 곳에서만 정의합니다.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..api import schemas
+from ..core.logger import get_logger
+from ..db import models
+
+logger = get_logger(__name__)
+
+
+# 사용자 정보와 프로필을 한 번의 조인으로 조회하는 쿼리. `UserInDB`에 필요한 컬럼만 명시하며,
+# 모듈 로드 시 한 번만 구성하여 SQLAlchemy의 컴파일 캐시와 asyncpg의
+# prepared statement 캐시를 요청 간에 재사용합니다.
+_USER_LOOKUP_STMT = (
+    select(
+        models.User.user_id,
+        models.User.username,
+        models.User.hashed_password,
+        models.User.is_active,
+        models.User.created_at,
+        models.UserProfile.profile_text,
+    )
+    .outerjoin(
+        models.UserProfile,
+        models.User.user_id == models.UserProfile.user_id,
+    )
+    .where(models.User.username == bindparam("username"))
+)
+
+
+async def fetch_user_by_username(
+    db_session: AsyncSession, username: str
+) -> Optional[schemas.UserInDB]:
+    """
+    사용자 이름으로 사용자 정보(프로필 포함)를 조회합니다.
+
+    Args:
+        db_session (AsyncSession): 조회에 사용할 DB 세션.
+        username (str): 조회할 사용자 이름.
+
+    Returns:
+        Optional[schemas.UserInDB]: 사용자 정보. 존재하지 않으면 None.
+    """
+    result = await db_session.execute(
+        _USER_LOOKUP_STMT, {"username": username}
+    )
+    user_row = result.mappings().first()
+    if user_row is None:
+        logger.debug(
+            f"데이터베이스에서 사용자 '{username}'를 찾을 수 없습니다."
+        )
+        return None
+
+    # DB에서 읽은 값은 이미 스키마와 일치하므로 검증 없이 모델을 구성합니다.
+    return schemas.UserInDB.model_construct(**user_row)
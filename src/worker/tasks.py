@@ -13,13 +13,18 @@ API 서버의 응답 시간을 저하시키지 않으면서 시간이 오래 걸
 """
 
 import asyncio
+import functools
 import io
-import json
 import os
+import sys
 import tempfile
 import zipfile
-from typing import Any, Dict, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Deque, Dict, List, Tuple
 
+import numpy as np
 from git import Repo
 from git.exc import GitCommandError
 from langchain_community.document_loaders import (
@@ -58,6 +63,79 @@ CODE_LANGUAGE_MAP = {
     ".md": Language.MARKDOWN,
 }
 
+# 한 번에 임베딩하여 DB에 적재할 청크 수.
+# 전체 청크를 한 번에 임베딩하지 않고 배치 단위로 임베딩 → 적재를 반복하여,
+# 메모리에는 항상 한 배치 분량의 임베딩만 유지되도록 합니다.
+EMBED_BATCH_SIZE = 128
+
+# 인덱싱 실패 시 첨부파일 상태를 갱신하는 SQL (모듈 로드 시 한 번만 생성)
+_SET_ATTACHMENT_FAILED_SQL = text(
+    "UPDATE session_attachments SET status = 'failed' WHERE attachment_id = :id"
+)
+
+# 청크 분할 기준 (문자 수)
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+# 이보다 짧은 청크는 이웃 청크에 병합합니다. (병합 결과는 CHUNK_SIZE의 5%까지 초과 허용)
+MIN_CHUNK_SIZE = 100
+
+
+@functools.lru_cache(maxsize=None)
+def _get_code_splitter(language: Language) -> RecursiveCharacterTextSplitter:
+    """
+    언어별 코드 스플리터를 생성하고 캐싱합니다.
+
+    스플리터는 상태를 갖지 않으므로, 파일마다 새로 만들지 않고 언어별로 하나를 재사용합니다.
+    """
+    return RecursiveCharacterTextSplitter.from_language(
+        language=language, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+
+
+def _merge_small_chunks(chunks: List[Document]) -> List[Document]:
+    """
+    `MIN_CHUNK_SIZE`보다 짧은 청크를 인접한 청크 중 더 짧은 쪽에 병합합니다.
+
+    재귀 분할은 문단/섹션 끝에서 매우 짧은 꼬리 청크를 자주 남기는데, 이런 청크는 검색에
+    거의 기여하지 못하면서 임베딩 호출과 DB 행 수만 늘립니다.
+    메타데이터가 같은 청크끼리만 병합하며(예: PDF의 같은 페이지), 병합된 청크는
+    앞쪽 청크의 메타데이터를 유지합니다.
+
+    Args:
+        chunks (List[Document]): 분할기가 생성한 청크 리스트 (문서 내 순서).
+
+    Returns:
+        List[Document]: 짧은 청크가 병합된 청크 리스트.
+    """
+    max_merged_size = int(CHUNK_SIZE * 1.05)
+    merged: List[Document] = []
+    for i, chunk in enumerate(chunks):
+        text_ = chunk.page_content
+        if len(text_) >= MIN_CHUNK_SIZE:
+            merged.append(chunk)
+            continue
+
+        prev = merged[-1] if merged else None
+        nxt = chunks[i + 1] if i + 1 < len(chunks) else None
+        candidates = [
+            c
+            for c in (prev, nxt)
+            if c is not None
+            and c.metadata == chunk.metadata
+            and len(c.page_content) + len(text_) + 1 <= max_merged_size
+        ]
+        if not candidates:
+            merged.append(chunk)
+            continue
+
+        target = min(candidates, key=lambda c: len(c.page_content))
+        if target is prev:
+            prev.page_content = f"{prev.page_content}\n{text_}"
+        else:
+            nxt.page_content = f"{text_}\n{nxt.page_content}"
+    return merged
+
+
 # --- 전역 컴포넌트 (캐싱용) ---
 _global_vector_store = None
 _global_text_splitter = None
@@ -85,15 +163,13 @@ def init_worker(**kwargs):
 
         # 3. 텍스트 스플리터 생성
         _global_text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=200
+            chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
         )
 
         logger.info(">>> [Worker Init] 컴포넌트 초기화 완료.")
     except Exception as e:
         logger.critical(f">>> [Worker Init] 초기화 실패: {e}", exc_info=True)
         # 초기화 실패 시 프로세스를 종료하여 문제를 알림
-        import sys
-
         sys.exit(1)
 
 
@@ -108,31 +184,27 @@ def get_worker_components():
     }
 
 
-async def _load_and_split_documents(
+def _load_and_split_documents(
     temp_file_path: str,
     file_name: str,
     text_splitter_default: RecursiveCharacterTextSplitter,
 ) -> List[Document]:
     """
-    [비동기 헬퍼] 단일 파일을 로드하고 적절한 청크로 분할한 후, 각 청크에 대한 가상 질문(HyDE)을 생성합니다.
+    [헬퍼] 단일 파일을 로드하고 적절한 청크로 분할합니다.
 
     이 함수는 파일 처리 파이프라인의 핵심적인 단계를 담당합니다.
     1. 파일 확장자를 기반으로 적절한 `DocumentLoader`를 선택하여 파일 내용을 로드합니다.
     2. 코드 파일의 경우, 구문 구조를 더 잘 이해하는 언어별 `TextSplitter`를 사용합니다.
        - 예를 들어, Python 코드의 경우 함수나 클래스 정의를 기준으로 분할을 시도합니다.
-    3. 분할된 각 청크에 대해 `_generate_hypothetical_question`을 병렬로 호출하여
-       HyDE(Hypothetical Document Embeddings)를 위한 가상 질문을 생성합니다.
-    4. 최종적으로 각 `Document` 객체의 메타데이터에 생성된 가상 질문을 추가하여 반환합니다.
+    3. `MIN_CHUNK_SIZE`보다 짧은 청크는 인접한 청크에 병합합니다. (`_merge_small_chunks`)
 
     Args:
         temp_file_path (str): 처리할 파일이 저장된 임시 경로.
         file_name (str): 사용자가 업로드한 원본 파일 이름 (확장자 판별에 사용).
         text_splitter_default (RecursiveCharacterTextSplitter): 기본적으로 사용할 텍스트 분할기.
-        llm (BaseLLM): 가상 질문 생성을 위해 사용할 LLM.
 
     Returns:
-        List[Document]: 각 청크의 원본 내용과 함께, 'embedding_source_text' 메타데이터에
-                        가상 질문이 포함된 `Document` 객체의 리스트.
+        List[Document]: 분할된 청크 `Document` 객체의 리스트 (문서 내 순서).
     """
     file_ext = os.path.splitext(file_name)[1].lower()
     logger.debug(
@@ -157,11 +229,9 @@ async def _load_and_split_documents(
     splitter = text_splitter_default
     if language and language != Language.MARKDOWN:
         try:
-            # LangChain에서 제공하는 언어별 스플리터를 동적으로 생성합니다.
+            # LangChain에서 제공하는 언어별 스플리터를 사용합니다. (언어별로 캐싱)
             # 이는 코드의 논리적 단위를 더 잘 보존하며 청크를 생성하는 데 도움이 됩니다.
-            splitter = RecursiveCharacterTextSplitter.from_language(
-                language=language, chunk_size=1000, chunk_overlap=200
-            )
+            splitter = _get_code_splitter(language)
             logger.debug(f"'{language.value}' 언어용 스플리터를 사용합니다.")
         except Exception:
             # 지원되지 않는 언어이거나 관련 라이브러리가 없는 경우, 경고를 남기고 기본 스플리터를 사용합니다.
@@ -169,7 +239,7 @@ async def _load_and_split_documents(
                 f"'{language.value}'용 코드 스플리터 사용 실패. 기본 스플리터로 대체합니다."
             )
 
-    split_chunks = splitter.split_documents(docs)
+    split_chunks = _merge_small_chunks(splitter.split_documents(docs))
     logger.debug(
         f"'{file_name}' 파일을 {len(split_chunks)}개의 청크로 분할했습니다."
     )
@@ -177,41 +247,99 @@ async def _load_and_split_documents(
     return split_chunks
 
 
-def _initialize_components_for_task() -> Dict[str, Any]:
+async def _embed_batches(
+    embedding_model: Any, chunks: List[Document]
+) -> AsyncIterator[List[Tuple[str, Dict[str, Any], np.ndarray]]]:
     """
-    Celery 태스크 실행에 필요한 핵심 컴포넌트들을 초기화하고 딕셔너리 형태로 반환합니다.
+    [비동기 헬퍼] 청크를 `EMBED_BATCH_SIZE` 단위로 임베딩하여, 배치 순서대로 생성(yield)합니다.
 
-    Celery 워커는 API 서버와는 별개의 독립적인 프로세스에서 실행됩니다.
-    따라서 API 서버가 가진 컴포넌트(LLM, 벡터 저장소 등)의 인스턴스를 공유할 수 없습니다.
-    이 함수는 각 태스크가 실행될 때마다 설정(config.yml)을 다시 읽어
-    필요한 모든 컴포넌트를 새로 생성하는 역할을 합니다.
+    전체 청크의 임베딩을 한 번에 만들어 메모리에 쌓아두는 대신 배치 단위로 넘겨주어,
+    소비하는 쪽(벡터 저장소)이 배치마다 바로 적재할 수 있도록 합니다.
+    배치별 임베딩 요청은 `settings.embedding.concurrency`개까지 동시에 전송되어
+    임베딩 서버의 병렬 처리 능력을 활용하고, 앞선 배치의 DB 적재와도 겹쳐 실행됩니다.
 
-    Returns:
-        Dict[str, Any]: 초기화된 컴포넌트들을 담은 딕셔너리.
-                        - "embedding_model": 임베딩 생성을 위한 모델.
-                        - "vector_store": 청크와 임베딩을 저장/검색하기 위한 벡터 저장소.
-                        - "fast_llm": HyDE 등 빠른 응답이 필요한 곳에 사용할 LLM.
-                        - "text_splitter_default": 기본 텍스트 분할기.
-    """
-    logger.debug("Celery 태스크를 위한 컴포넌트 초기화를 시작합니다.")
-    settings = get_settings()
+    Args:
+        embedding_model (Any): `aembed_documents`를 제공하는 임베딩 모델.
+        chunks (List[Document]): 임베딩할 청크 리스트.
 
-    # 설정 파일(config.yml)을 기반으로 팩토리 함수를 사용하여 각 컴포넌트를 생성합니다.
-    embedding_model = factories.create_embedding_model(
-        settings.embedding, settings, settings.OPENAI_API_KEY
-    )
-    vector_store = factories.create_vector_store(
-        settings.vector_store, settings, embedding_model
-    )
-    text_splitter_default = RecursiveCharacterTextSplitter(
-        chunk_size=1000, chunk_overlap=200
+    Yields:
+        List[Tuple[str, Dict[str, Any], np.ndarray]]:
+            배치 내 각 청크의 `(chunk_text, metadata, embedding)` 튜플 리스트.
+    """
+    concurrency = get_settings().embedding.concurrency
+    batches = (
+        chunks[start : start + EMBED_BATCH_SIZE]
+        for start in range(0, len(chunks), EMBED_BATCH_SIZE)
     )
-    logger.debug("Celery 태스크 컴포넌트 초기화 완료.")
-    return {
-        "embedding_model": embedding_model,
-        "vector_store": vector_store,
-        "text_splitter_default": text_splitter_default,
-    }
+    # 진행 중인 임베딩 요청은 최대 `concurrency`개만 유지합니다. 앞선 배치의 결과를
+    # 소비할 때마다 다음 배치를 하나씩 예약하므로, 청크 수와 무관하게 태스크와
+    # 대기 중인 결과가 쌓이지 않습니다. 배치는 순서대로 생성되므로 저장 순서도 유지됩니다.
+    pending: Deque[Tuple[List[Document], asyncio.Task]] = deque()
+
+    def schedule_next_batch() -> None:
+        batch = next(batches, None)
+        if batch is not None:
+            pending.append(
+                (
+                    batch,
+                    asyncio.create_task(
+                        embedding_model.aembed_documents(
+                            [chunk.page_content for chunk in batch]
+                        )
+                    ),
+                )
+            )
+
+    try:
+        for _ in range(concurrency):
+            schedule_next_batch()
+        while pending:
+            batch, embed_task = pending.popleft()
+            embeddings = await embed_task
+            schedule_next_batch()
+            # 임베딩 API는 파이썬 float(float64) 리스트를 반환하므로, 저장 전에 float32 배열로
+            # 변환하여 적재 경로에서 다루는 메모리 양을 절반으로 줄입니다.
+            matrix = np.asarray(embeddings, np.float32)
+            # 세션 KB는 내적(inner product) 인덱스를 사용하므로, 저장되는 벡터는 모두
+            # 단위 길이여야 합니다. 검색마다 정규화하지 않도록 적재 시 한 번만 정규화합니다.
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1, norms)
+            # 배치 전체를 halfvec 컬럼의 바이너리 전송 형식(빅엔디언 float16)으로 한 번에
+            # 변환합니다. 각 행은 이 행렬의 뷰(view)이므로, pgvector 코덱이 행마다
+            # 다시 변환/복사하지 않고 바이트를 그대로 COPY 스트림에 씁니다.
+            matrix = matrix.astype(">f2")
+            yield [
+                (chunk.page_content, chunk.metadata, matrix[i])
+                for i, chunk in enumerate(batch)
+            ]
+    finally:
+        # 중간에 실패한 경우, 아직 진행 중인 임베딩 요청을 취소하고 정리합니다.
+        embed_tasks = [embed_task for _, embed_task in pending]
+        for embed_task in embed_tasks:
+            embed_task.cancel()
+        await asyncio.gather(*embed_tasks, return_exceptions=True)
+
+
+async def _embed_and_store_chunks(
+    vector_store: Any, attachment_id: int, chunks: List[Document]
+) -> int:
+    """
+    [비동기 헬퍼] 청크를 배치 단위로 임베딩하면서 벡터 저장소에 바로 적재합니다.
+
+    Args:
+        vector_store (Any): 임베딩 모델을 가진 벡터 저장소.
+        attachment_id (int): 청크가 속한 첨부파일 ID.
+        chunks (List[Document]): 적재할 청크 리스트.
+
+    Returns:
+        int: 저장된 청크 수.
+    """
+    async with aclosing(
+        _embed_batches(vector_store.embedding_model, chunks)
+    ) as batches:
+        return await vector_store.add_session_attachment_chunks(
+            attachment_id, batches
+        )
 
 
 # --- Celery 태스크 정의 ---
@@ -231,55 +359,17 @@ def process_session_attachment_indexing(
         text_splitter = comps["text_splitter"]
 
         # 1. 문서 로드 및 분할 (HyDE 없음)
-        chunks = asyncio.run(
-            _load_and_split_documents(file_path, file_name, text_splitter)
-        )
+        chunks = _load_and_split_documents(file_path, file_name, text_splitter)
 
         if not chunks:
             logger.warning("인덱싱할 내용 없음.")
             return {"status": "warning", "message": "No content"}
 
-        # 2. 임베딩 생성
-        texts_to_embed = [chunk.page_content for chunk in chunks]
-        embeddings = vector_store.embedding_model.embed_documents(
-            texts_to_embed
+        # 2. 임베딩 생성 및 DB 저장 (배치 단위로 임베딩 → 적재)
+        asyncio.run(
+            _embed_and_store_chunks(vector_store, attachment_id, chunks)
         )
 
-        # 3. DB 저장 (청크 + 임베딩)
-        chunks_to_store = [
-            {
-                "attachment_id": attachment_id,
-                "chunk_text": chunk.page_content,
-                "embedding": str(vec),
-                "extra_metadata": json.dumps(chunk.metadata),
-            }
-            for chunk, vec in zip(chunks, embeddings)
-        ]
-
-        async def save_to_db():
-            async with vector_store.AsyncSessionLocal() as session:
-                async with session.begin():
-                    # 청크 삽입
-                    await session.execute(
-                        text(
-                            """
-                            INSERT INTO session_attachment_chunks 
-                            (attachment_id, chunk_text, embedding, extra_metadata)
-                            VALUES (:attachment_id, :chunk_text, :embedding, :extra_metadata)
-                        """
-                        ),
-                        chunks_to_store,
-                    )
-                    # 상태 업데이트
-                    await session.execute(
-                        text(
-                            "UPDATE session_attachments SET status = 'temporary' WHERE attachment_id = :id"
-                        ),
-                        {"id": attachment_id},
-                    )
-
-        asyncio.run(save_to_db())
-
         # (선택) 임시 파일 삭제
         # if os.path.exists(file_path): os.remove(file_path)
 
@@ -290,17 +380,13 @@ def process_session_attachment_indexing(
 
         # 실패 상태 업데이트
         async def set_failed():
-            components = (
-                _initialize_components_for_task()
-            )  # 세션 생성을 위해 필요
-            vs = components["vector_store"]
+            vs = get_worker_components()[
+                "vector_store"
+            ]  # 세션 생성을 위해 필요
             async with vs.AsyncSessionLocal() as session:
                 async with session.begin():
                     await session.execute(
-                        text(
-                            "UPDATE session_attachments SET status = 'failed' WHERE attachment_id = :id"
-                        ),
-                        {"id": attachment_id},
+                        _SET_ATTACHMENT_FAILED_SQL, {"id": attachment_id}
                     )
 
         try:
@@ -324,43 +410,58 @@ def process_session_github_indexing(self, attachment_id: int, repo_url: str):
     )
 
     try:
-        components = _initialize_components_for_task()
-        vector_store = components["vector_store"]
-        text_splitter_default = components["text_splitter_default"]
+        comps = get_worker_components()
+        vector_store = comps["vector_store"]
+        text_splitter_default = comps["text_splitter"]
         all_chunks_to_index = []
 
-        # 1. GitHub 클론 및 파일 처리 (기존 로직과 동일)
+        def load_repo_file(
+            file_path: str, relative_path: str
+        ) -> List[Document]:
+            try:
+                chunks = _load_and_split_documents(
+                    file_path, relative_path, text_splitter_default
+                )
+            except Exception as e:
+                logger.warning(
+                    f"GitHub 리포지토리 내 파일 '{relative_path}' 처리 중 오류: {e}"
+                )
+                return []
+            # [세션 KB용 수정] 메타데이터 변경
+            for chunk in chunks:
+                chunk.metadata.update(
+                    {
+                        "source_type": "session-github",
+                        "repo_url": repo_url,
+                        "repo_name": repo_name,
+                        "source": relative_path,
+                    }
+                )
+            return chunks
+
+        # 1. GitHub 클론 및 파일 처리
         with tempfile.TemporaryDirectory() as temp_dir:
             Repo.clone_from(repo_url, temp_dir, depth=50)
-            for root, _, files in os.walk(temp_dir):
-                if ".git" in root.split(os.sep):
-                    continue
+            file_paths = []
+            for root, dirs, files in os.walk(temp_dir):
+                # .git 디렉터리는 탐색 대상에서 제외합니다.
+                dirs[:] = [d for d in dirs if d != ".git"]
                 for file in files:
                     file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, temp_dir)
-                    try:
-                        chunks = asyncio.run(
-                            _load_and_split_documents(
-                                file_path,
-                                relative_path,
-                                text_splitter_default,
-                            )
-                        )
-                        # [세션 KB용 수정] 메타데이터 변경
-                        for chunk in chunks:
-                            chunk.metadata.update(
-                                {
-                                    "source_type": "session-github",
-                                    "repo_url": repo_url,
-                                    "repo_name": repo_name,
-                                    "source": relative_path,
-                                }
-                            )
-                        all_chunks_to_index.extend(chunks)
-                    except Exception as e:
-                        logger.warning(
-                            f"GitHub 리포지토리 내 파일 '{relative_path}' 처리 중 오류: {e}"
-                        )
+                    file_paths.append(
+                        (file_path, os.path.relpath(file_path, temp_dir))
+                    )
+
+            # 파일 로드/파싱/분할은 파일마다 독립적이므로 스레드 풀에서 병렬로 처리합니다.
+            # `map`은 입력 순서대로 결과를 돌려주므로 청크 순서는 순차 처리와 동일합니다.
+            max_workers = (
+                get_settings().INDEXING_LOAD_THREADS or os.cpu_count()
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for chunks in executor.map(
+                    lambda paths: load_repo_file(*paths), file_paths
+                ):
+                    all_chunks_to_index.extend(chunks)
 
         if not all_chunks_to_index:
             logger.warning(
@@ -371,48 +472,15 @@ def process_session_github_indexing(self, attachment_id: int, repo_url: str):
                 "message": "No content could be indexed.",
             }
 
-        texts_to_embed = [chunk.page_content for chunk in all_chunks_to_index]
-        chunk_embeddings = vector_store.embedding_model.embed_documents(
-            texts_to_embed
-        )
-
-        # 3. [핵심 수정] 'session_attachment_chunks' 테이블에 저장
-        # (process_session_directory_indexing의 저장 로직과 동일)
-        chunks_to_store = [
-            {
-                "attachment_id": attachment_id,
-                "chunk_text": chunk.page_content,
-                "embedding": str(embedding_vector),
-                "extra_metadata": json.dumps(chunk.metadata),
-            }
-            for chunk, embedding_vector in zip(
-                all_chunks_to_index, chunk_embeddings
+        # 2. 임베딩 생성 및 'session_attachment_chunks' 테이블에 저장
+        # (배치 단위로 임베딩 → 적재, 단일 파일 인덱싱과 동일한 파이프라인)
+        asyncio.run(
+            _embed_and_store_chunks(
+                vector_store, attachment_id, all_chunks_to_index
             )
-        ]
-
-        async def save_chunks_to_db():
-            if not hasattr(vector_store, "AsyncSessionLocal"):
-                raise TypeError("Vector store is missing AsyncSessionLocal")
-            async with vector_store.AsyncSessionLocal() as session:
-                async with session.begin():
-                    stmt_chunks_insert = text(
-                        """
-                        INSERT INTO session_attachment_chunks
-                        (attachment_id, chunk_text, embedding, extra_metadata)
-                        VALUES (:attachment_id, :chunk_text, :embedding, :extra_metadata)
-                        """
-                    )
-                    await session.execute(stmt_chunks_insert, chunks_to_store)
-                    stmt_update_status = text(
-                        "UPDATE session_attachments SET status = 'temporary' WHERE attachment_id = :attachment_id"
-                    )
-                    await session.execute(
-                        stmt_update_status, {"attachment_id": attachment_id}
-                    )
-
-        asyncio.run(save_chunks_to_db())
+        )
 
-        success_message = f"'{repo_name}' 리포지토리 인덱싱 완료. {len(chunks_to_store)}개 청크 저장됨."
+        success_message = f"'{repo_name}' 리포지토리 인덱싱 완료. {len(all_chunks_to_index)}개 청크 저장됨."
         logger.info(
             f"--- [Celery Task ID: {task_id}] 세션 GitHub 인덱싱 성공 ---"
         )
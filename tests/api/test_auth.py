@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from src.api import schemas
+from src.api.endpoints import auth
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeSession:
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, params):
+        self.log.append(("execute", statement, params))
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+@pytest.fixture
+def db_log(monkeypatch) -> list:
+    log: list = []
+    monkeypatch.setattr(auth, "AsyncSessionLocal", lambda: FakeSession(log))
+    monkeypatch.setattr(
+        auth.dependencies,
+        "invalidate_user_cache",
+        lambda username: log.append(("invalidate", username)),
+    )
+    return log
+
+
+def _user(hashed_password: str) -> schemas.UserInDB:
+    return schemas.UserInDB.model_construct(
+        user_id=1,
+        username="alice",
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+        hashed_password=hashed_password,
+        profile_text=None,
+    )
+
+
+def _use_user(monkeypatch, user) -> None:
+    async def fake_get_user_by_username(username):
+        return user
+
+    monkeypatch.setattr(
+        auth.dependencies, "get_user_by_username", fake_get_user_by_username
+    )
+
+
+def _form(username: str, password: str) -> SimpleNamespace:
+    return SimpleNamespace(username=username, password=password)
+
+
+@pytest.mark.anyio
+async def test_login_with_bcrypt_hash_rehashes_and_invalidates(
+    monkeypatch, db_log
+):
+    _use_user(monkeypatch, _user(bcrypt.hash("s3cret")))
+
+    response = await auth.login_for_access_token(_form("alice", "s3cret"))
+
+    assert response["token_type"] == "bearer"
+    execute = db_log[0]
+    assert execute[1] is auth._UPDATE_PASSWORD_HASH_SQL
+    assert execute[2]["user_id"] == 1
+    assert execute[2]["hashed_password"].startswith("$argon2id$")
+    assert db_log[1:] == ["commit", ("invalidate", "alice")]
+
+
+@pytest.mark.anyio
+async def test_login_with_argon2_hash_does_not_rehash(monkeypatch, db_log):
+    _use_user(monkeypatch, _user(auth.security.get_password_hash("s3cret")))
+
+    await auth.login_for_access_token(_form("alice", "s3cret"))
+
+    assert db_log == []
+
+
+@pytest.mark.anyio
+async def test_login_for_unknown_user_verifies_against_dummy_hash(
+    monkeypatch, db_log
+):
+    _use_user(monkeypatch, None)
+    verified_hashes = []
+    verify = auth.security.verify_and_update_password
+
+    def recording_verify(password, password_hash):
+        verified_hashes.append(password_hash)
+        return verify(password, password_hash)
+
+    monkeypatch.setattr(
+        auth.security, "verify_and_update_password", recording_verify
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.login_for_access_token(_form("nobody", "s3cret"))
+
+    assert exc_info.value.status_code == 401
+    assert verified_hashes == [auth._get_dummy_password_hash()]
+    assert db_log == []
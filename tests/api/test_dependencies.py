@@ -0,0 +1,169 @@
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from src.api import dependencies, schemas
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeClock:
+    """TTLCache의 만료를 직접 제어하기 위한 타이머."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    for name in (
+        "_token_cache",
+        "_rejected_token_cache",
+        "_user_cache",
+        "_missing_user_cache",
+    ):
+        cache = getattr(dependencies, name)
+        monkeypatch.setattr(
+            dependencies,
+            name,
+            TTLCache(maxsize=cache.maxsize, ttl=cache.ttl, timer=clock),
+        )
+    return clock
+
+
+@pytest.fixture
+def verify_calls(monkeypatch) -> list:
+    calls = []
+
+    def fake_verify_token(token, credentials_exception):
+        calls.append(token)
+        if token == "bad":
+            raise credentials_exception
+        return schemas.TokenData(username="alice", exp=int(time.time()) + 60)
+
+    monkeypatch.setattr(dependencies, "_VERIFY_TOKEN_IN_THREAD", False)
+    monkeypatch.setattr(dependencies, "verify_token", fake_verify_token)
+    return calls
+
+
+@pytest.fixture
+def users(monkeypatch) -> dict:
+    db = {}
+    db["lookups"] = []
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_fetch(session, username):
+        db["lookups"].append(username)
+        return db.get(username)
+
+    monkeypatch.setattr(dependencies, "ReadOnlySessionLocal", fake_session)
+    monkeypatch.setattr(
+        dependencies.user_service, "fetch_user_by_username", fake_fetch
+    )
+    return db
+
+
+def _user(username: str) -> schemas.UserInDB:
+    return schemas.UserInDB(
+        user_id=1,
+        username=username,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+        hashed_password="hash",
+    )
+
+
+@pytest.mark.anyio
+async def test_token_verification_is_cached_until_ttl(clock, verify_calls):
+    await dependencies._verify_token_cached("good")
+    await dependencies._verify_token_cached("good")
+    assert verify_calls == ["good"]
+
+    clock.now += dependencies._TOKEN_CACHE_TTL_SECONDS + 1
+    await dependencies._verify_token_cached("good")
+    assert verify_calls == ["good", "good"]
+
+
+@pytest.mark.anyio
+async def test_expired_token_is_verified_again(
+    clock, verify_calls, monkeypatch
+):
+    await dependencies._verify_token_cached("good")
+    monkeypatch.setattr(time, "time", lambda: 2**40)
+    await dependencies._verify_token_cached("good")
+    assert verify_calls == ["good", "good"]
+
+
+@pytest.mark.anyio
+async def test_rejected_token_is_cached(clock, verify_calls):
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependencies._verify_token_cached("bad")
+        assert exc_info.value.status_code == 401
+    assert verify_calls == ["bad"]
+
+
+@pytest.mark.anyio
+async def test_rejections_raise_distinct_exceptions(clock, verify_calls):
+    raised = []
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependencies._verify_token_cached("bad")
+        raised.append(exc_info.value)
+    assert raised[0] is not raised[1]
+
+
+@pytest.mark.anyio
+async def test_user_lookup_is_cached_until_ttl(clock, users):
+    users["alice"] = _user("alice")
+    assert (await dependencies.get_user_by_username("alice")).username == (
+        "alice"
+    )
+    await dependencies.get_user_by_username("alice")
+    assert users["lookups"] == ["alice"]
+
+    clock.now += dependencies._USER_CACHE_TTL_SECONDS + 1
+    await dependencies.get_user_by_username("alice")
+    assert users["lookups"] == ["alice", "alice"]
+
+
+@pytest.mark.anyio
+async def test_invalidate_user_cache_forces_lookup(clock, users):
+    users["alice"] = _user("alice")
+    await dependencies.get_user_by_username("alice")
+    dependencies.invalidate_user_cache("alice")
+    await dependencies.get_user_by_username("alice")
+    assert users["lookups"] == ["alice", "alice"]
+
+
+@pytest.mark.anyio
+async def test_missing_user_is_cached_briefly(clock, users):
+    assert await dependencies.get_user_by_username("bob") is None
+    assert await dependencies.get_user_by_username("bob") is None
+    assert users["lookups"] == ["bob"]
+
+    clock.now += dependencies._missing_user_cache.ttl + 1
+    assert await dependencies.get_user_by_username("bob") is None
+    assert users["lookups"] == ["bob", "bob"]
+
+
+@pytest.mark.anyio
+async def test_registration_clears_missing_user_entry(clock, users):
+    assert await dependencies.get_user_by_username("bob") is None
+    users["bob"] = _user("bob")
+    dependencies.invalidate_user_cache("bob")
+    assert (await dependencies.get_user_by_username("bob")).username == "bob"
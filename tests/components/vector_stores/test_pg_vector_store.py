@@ -0,0 +1,175 @@
+from contextlib import asynccontextmanager
+
+import numpy as np
+import orjson
+import pytest
+
+from src.components.vector_stores import pg_vector_store
+from src.components.vector_stores.pg_vector_store import PgVectorStore
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeDriverConnection:
+    def __init__(self, events: list, fail_on_copy: int | None) -> None:
+        self.events = events
+        self.fail_on_copy = fail_on_copy
+        self.copies = 0
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies += 1
+        if self.copies == self.fail_on_copy:
+            raise RuntimeError("copy failed")
+        self.events.append(("copy", table, records, columns))
+
+
+class FakeSession:
+    """트랜잭션 경계와 실행된 SQL을 순서대로 기록하는 AsyncSession 대역."""
+
+    def __init__(self, fail_on_copy: int | None = None) -> None:
+        self.events: list = []
+        self.driver_connection = FakeDriverConnection(
+            self.events, fail_on_copy
+        )
+
+    @asynccontextmanager
+    async def begin(self):
+        self.events.append("begin")
+        try:
+            yield
+        except BaseException:
+            self.events.append("rollback")
+            raise
+        self.events.append("commit")
+
+    async def execute(self, statement, params):
+        self.events.append(("execute", statement, params))
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+
+def _store(session: FakeSession) -> PgVectorStore:
+    store = PgVectorStore(settings=None, embedding_model=None)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    store.AsyncSessionLocal = session_factory
+    return store
+
+
+def _batch(*texts: str):
+    embedding = np.ones(4, np.float32) / 2
+    return [
+        (text_, {"source": text_}, embedding.astype(">f2")) for text_ in texts
+    ]
+
+
+async def _iterate(batches, fail_after: int | None = None):
+    for i, batch in enumerate(batches):
+        if i == fail_after:
+            raise RuntimeError("embedding failed")
+        yield batch
+
+
+def _executed(session: FakeSession) -> list:
+    return [
+        event[1]
+        for event in session.events
+        if isinstance(event, tuple) and event[0] == "execute"
+    ]
+
+
+@pytest.mark.anyio
+async def test_add_chunks_copies_each_batch_in_its_own_transaction():
+    session = FakeSession()
+    store = _store(session)
+
+    stored = await store.add_session_attachment_chunks(
+        7, _iterate([_batch("a", "b"), _batch("c")])
+    )
+
+    assert stored == 3
+    kinds = [e if isinstance(e, str) else e[0] for e in session.events]
+    assert kinds == [
+        "begin",
+        "execute",
+        "execute",
+        "commit",
+        "begin",
+        "copy",
+        "commit",
+        "begin",
+        "copy",
+        "commit",
+        "begin",
+        "execute",
+        "commit",
+    ]
+    assert _executed(session) == [
+        pg_vector_store._MARK_ATTACHMENT_INDEXING_SQL,
+        pg_vector_store._DELETE_SESSION_CHUNKS_SQL,
+        pg_vector_store._MARK_ATTACHMENT_SEARCHABLE_SQL,
+    ]
+
+
+@pytest.mark.anyio
+async def test_add_chunks_copies_half_precision_records():
+    session = FakeSession()
+    store = _store(session)
+
+    await store.add_session_attachment_chunks(7, _iterate([_batch("a")]))
+
+    copies = [e for e in session.events if e[0] == "copy"]
+    _, table, records, columns = copies[0]
+    assert table == "session_attachment_chunks"
+    assert columns == pg_vector_store._SESSION_CHUNK_COPY_COLUMNS
+    attachment_id, chunk_text, embedding, metadata = records[0]
+    assert (attachment_id, chunk_text) == (7, "a")
+    assert embedding.dtype == np.dtype(">f2")
+    assert orjson.loads(metadata) == {"source": "a"}
+
+
+@pytest.mark.anyio
+async def test_add_chunks_marks_attachment_failed_when_embedding_fails():
+    session = FakeSession()
+    store = _store(session)
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        await store.add_session_attachment_chunks(
+            7, _iterate([_batch("a"), _batch("b")], fail_after=1)
+        )
+
+    executed = _executed(session)
+    assert pg_vector_store._MARK_ATTACHMENT_SEARCHABLE_SQL not in executed
+    assert executed[-2:] == [
+        pg_vector_store._DELETE_SESSION_CHUNKS_SQL,
+        pg_vector_store._MARK_ATTACHMENT_FAILED_SQL,
+    ]
+    assert session.events[-1] == "commit"
+
+
+@pytest.mark.anyio
+async def test_add_chunks_marks_attachment_failed_when_copy_fails():
+    session = FakeSession(fail_on_copy=2)
+    store = _store(session)
+
+    with pytest.raises(RuntimeError, match="copy failed"):
+        await store.add_session_attachment_chunks(
+            7, _iterate([_batch("a"), _batch("b")])
+        )
+
+    # 실패한 배치의 트랜잭션은 롤백되고, 실패 상태는 새 트랜잭션에서 기록됩니다.
+    assert "rollback" in session.events
+    assert _executed(session)[-1] == (
+        pg_vector_store._MARK_ATTACHMENT_FAILED_SQL
+    )
+    assert session.events[-1] == "commit"
@@ -0,0 +1,38 @@
+from passlib.hash import bcrypt
+
+from src.core import security
+
+
+def test_new_hashes_use_argon2id():
+    hashed = security.get_password_hash("s3cret")
+    assert hashed.startswith("$argon2id$")
+    assert security.verify_and_update_password("s3cret", hashed) == (
+        True,
+        None,
+    )
+
+
+def test_bcrypt_hash_verifies_and_returns_argon2_hash():
+    legacy_hash = bcrypt.hash("s3cret")
+
+    ok, new_hash = security.verify_and_update_password("s3cret", legacy_hash)
+
+    assert ok is True
+    assert new_hash.startswith("$argon2id$")
+    assert security.verify_password("s3cret", new_hash)
+
+
+def test_bcrypt_hash_with_wrong_password_is_not_rehashed():
+    legacy_hash = bcrypt.hash("s3cret")
+    assert security.verify_and_update_password("wrong", legacy_hash) == (
+        False,
+        None,
+    )
+
+
+def test_access_token_cache_accepts_unhashable_claims():
+    data = {"sub": "alice", "permission_groups": ["all", "dev"]}
+    token = security.create_access_token(data)
+    assert security.create_access_token(dict(reversed(data.items()))) == (
+        token
+    )
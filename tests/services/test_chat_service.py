@@ -0,0 +1,43 @@
+import json
+
+from src.services import chat_service
+
+
+def _baseline_frame(event: str, data) -> str:
+    """orjson 도입 전의 `json.dumps` 기반 SSE 프레임."""
+    return f"data: {json.dumps({'event': event, 'data': data})}\n\n"
+
+
+def _decode_frame(frame: bytes) -> dict:
+    text = frame.decode("utf-8")
+    assert text.startswith("data: ")
+    assert text.endswith("\n\n")
+    return json.loads(text[len("data: ") : -2])
+
+
+def _baseline_payload(event: str, data) -> dict:
+    return json.loads(_baseline_frame(event, data)[len("data: ") : -2])
+
+
+def test_sse_payload_matches_json_frame():
+    data = {"chunk": '안녕하세요 "quoted"\n', "new_message": True}
+    frame = chat_service._build_sse_payload("token", data)
+    assert isinstance(frame, bytes)
+    assert _decode_frame(frame) == _baseline_payload("token", data)
+
+
+def test_sse_token_frame_matches_build_sse_payload():
+    data = {"chunk": "부분 응답", "new_message": False}
+    frame = (
+        chat_service._SSE_TOKEN_PREFIX
+        + chat_service.orjson.dumps(data)
+        + chat_service._SSE_FRAME_SUFFIX
+    )
+    assert frame == chat_service._build_sse_payload("token", data)
+    assert _decode_frame(frame) == _baseline_payload("token", data)
+
+
+def test_sse_end_frame():
+    assert _decode_frame(chat_service._SSE_END_FRAME) == _baseline_payload(
+        "end", "Stream ended"
+    )
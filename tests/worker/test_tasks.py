@@ -0,0 +1,53 @@
+from langchain_core.documents import Document
+
+from src.worker.tasks import CHUNK_SIZE, MIN_CHUNK_SIZE, _merge_small_chunks
+
+
+def _doc(length: int, char: str = "a", **metadata) -> Document:
+    return Document(page_content=char * length, metadata=metadata)
+
+
+def test_merge_small_chunks_keeps_large_chunks():
+    chunks = [_doc(MIN_CHUNK_SIZE, "a"), _doc(MIN_CHUNK_SIZE * 2, "b")]
+    merged = _merge_small_chunks(chunks)
+    assert [c.page_content for c in merged] == [
+        "a" * MIN_CHUNK_SIZE,
+        "b" * MIN_CHUNK_SIZE * 2,
+    ]
+
+
+def test_merge_small_chunks_appends_tail_to_previous_chunk():
+    chunks = [_doc(500, "a", page=1), _doc(10, "b", page=1)]
+    merged = _merge_small_chunks(chunks)
+    assert len(merged) == 1
+    assert merged[0].page_content == "a" * 500 + "\n" + "b" * 10
+    assert merged[0].metadata == {"page": 1}
+
+
+def test_merge_small_chunks_prepends_head_to_next_chunk():
+    chunks = [_doc(10, "a", page=1), _doc(500, "b", page=1)]
+    merged = _merge_small_chunks(chunks)
+    assert len(merged) == 1
+    assert merged[0].page_content == "a" * 10 + "\n" + "b" * 500
+
+
+def test_merge_small_chunks_prefers_shorter_neighbour():
+    chunks = [_doc(800, "a"), _doc(10, "b"), _doc(300, "c")]
+    merged = _merge_small_chunks(chunks)
+    assert [c.page_content for c in merged] == [
+        "a" * 800,
+        "b" * 10 + "\n" + "c" * 300,
+    ]
+
+
+def test_merge_small_chunks_does_not_cross_metadata_boundaries():
+    chunks = [_doc(500, "a", page=1), _doc(10, "b", page=2)]
+    merged = _merge_small_chunks(chunks)
+    assert [c.page_content for c in merged] == ["a" * 500, "b" * 10]
+    assert [c.metadata for c in merged] == [{"page": 1}, {"page": 2}]
+
+
+def test_merge_small_chunks_respects_max_merged_size():
+    chunks = [_doc(CHUNK_SIZE, "a"), _doc(MIN_CHUNK_SIZE - 1, "b")]
+    merged = _merge_small_chunks(chunks)
+    assert len(merged) == 2